@@ -1,3 +1,4 @@
+import asyncio
 from typing import List
 from dataclasses import dataclass, field
 
@@ -10,8 +11,7 @@ from service.config.envvars import EnvVarsConfigService
 from service.crawl.typex import ICrawlService
 from service.crawl.craw4ai import AICrawlService
 from service.repo.typex import IRepoService
-from service.repo.github import GithubRepoService
-from service.repo.gitlab import GitlabRepoService
+from service.repo.factory import get_repo_service, reads_md_docs
 
 from agent.typex import AgentParameters
 from .prompts import SYSTEM_PROMPT
@@ -37,22 +37,30 @@ async def initialize_agent_params() -> AgentParameters:
     # Initialize services
     cfg_svc = EnvVarsConfigService()
     crawl_svc = AICrawlService(cfg_svc)
-    repo_svc = GithubRepoService(cfg_svc) if cfg_svc.get_repo_type() == "github" else GitlabRepoService(cfg_svc)
+    repo_svc = get_repo_service(cfg_svc)
     docs = []    
 
     try:
         if not cfg_svc.get_repo_urls():
             raise ValueError("No repo URLs provided. Please provide a comma-delimited list of repo URLs.")
 
-        md_urls = []
         repo_urls = cfg_svc.get_repo_urls().split(',')
         print(f"Ingesting the following repo URLs: {repo_urls}")
-        for repo_url in repo_urls:
-            md_urls.extend(await repo_svc.get_md_urls(repo_url.strip()))
 
-        print(f"Crawling the following md URLs: {md_urls}")
         crawl_results = []
-        crawl_results.extend(await crawl_svc.crawl(md_urls, max_depth=1, max_concurrent=10))
+        if reads_md_docs(cfg_svc):
+            # One archive download (or local read) per repo instead of listing and crawling every .md URL
+            crawl_results.extend(await repo_svc.get_all_md_docs(repo_urls, skip_failed=True))
+        else:
+            # Start crawling each repo's md URLs as soon as the repo is discovered
+            crawl_tasks = []
+            async for md_urls in repo_svc.iter_md_urls(repo_urls, skip_failed=True):
+                print(f"Crawling the following md URLs: {md_urls}")
+                crawl_tasks.append(asyncio.create_task(crawl_svc.crawl(md_urls, max_depth=1, max_concurrent=10)))
+
+            for results in await asyncio.gather(*crawl_tasks):
+                crawl_results.extend(results)
+            print(f"Crawl cache stats: {crawl_svc.get_cache_stats()}")
 
         # Initialize RAG instance and insert docs
         for i, doc in enumerate(crawl_results):
@@ -80,8 +88,8 @@ async def initialize_agent_params() -> AgentParameters:
 # Called from the main app to finalize the agent parameters
 async def finalize_agent_params(parameters: AgentParameters) -> None:
     """Finalize the agent dependencies."""
-    parameters.deps.crawl_svc.finalize()
-    parameters.deps.repo_svc.finalize()
+    await parameters.deps.crawl_svc.finalize()
+    await parameters.deps.repo_svc.finalize()
 
 @ctx_agent.system_prompt
 async def inject_docs(ctx: RunContext[CtxAgentDeps]) -> str:
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 import asyncio
 
 from pydantic_ai import RunContext
@@ -19,6 +20,7 @@ from .prompts import SYSTEM_PROMPT
 class DocAgentDeps:
     """Dependencies for the DOC agent."""
     ragsvc: IRAGService
+    warmup_task: Optional[asyncio.Task] = None
 
 # global variable to hold the agent instance
 doc_agent = Agent(
@@ -35,7 +37,8 @@ async def initialize_agent_params() -> AgentParameters:
     cfg_svc = EnvVarsConfigService()
     crawl_svc = AICrawlService(cfg_svc)
     rag_svc = LightRAGService(cfg_svc, crawl_svc)
-    deps = DocAgentDeps(ragsvc=rag_svc)
+    # Warm up the RAG in the background so the first question lands on a hot index
+    deps = DocAgentDeps(ragsvc=rag_svc, warmup_task=asyncio.create_task(rag_svc.warm_up()))
     return AgentParameters(
         title="Doc Agent",
         description="An agent that answers questions about documentation.",
@@ -46,6 +49,14 @@ async def initialize_agent_params() -> AgentParameters:
 # Called from the main app to finalize the agent parameters
 async def finalize_agent_params(parameters: AgentParameters) -> None:
     """Finalize the agent dependencies."""
+    warmup_task = parameters.deps.warmup_task
+    if warmup_task is not None:
+        # Wait for the cancelled warm-up to let go of the storages before finalizing them
+        warmup_task.cancel()
+        try:
+            await warmup_task
+        except asyncio.CancelledError:
+            pass
     await parameters.deps.ragsvc.finalize()
 
 @doc_agent.tool
@@ -1,13 +1,14 @@
 import sys
+import asyncio
 import argparse
 from typing import Dict, Callable, Awaitable
 from dotenv import load_dotenv
 
 from service.config.envvars import EnvVarsConfigService
-from service.repo.github import GithubRepoService
-from service.repo.gitlab import GitlabRepoService
+from service.repo.factory import get_repo_service, reads_md_docs
 from service.crawl.craw4ai import AICrawlService
-from service.chunker.semantic import SemanticChunkerService
+from service.crawl.frontier import get_crawl_job_id
+from service.chunker.factory import get_chunker_service
 from service.graph.graphiti import GraphitiGraphService
 from service.rag.naive import NaiveRAGService
 from service.rag.lightrag import LightRAGService
@@ -23,9 +24,9 @@ def ingest_progress_callback(ingestor: str, current: int, total: int):
 async def ingest_naive(repo_urls: str) -> None:
     # Initialize services
     cfg_svc = EnvVarsConfigService()
-    repo_svc = GithubRepoService(cfg_svc) if cfg_svc.get_repo_type() == "github" else GitlabRepoService(cfg_svc)
+    repo_svc = get_repo_service(cfg_svc)
     crawl_svc = AICrawlService(cfg_svc)
-    chunker_svc = SemanticChunkerService(cfg_svc)
+    chunker_svc = get_chunker_service(cfg_svc)
     rag_svc = NaiveRAGService(cfg_svc, crawl_svc, chunker_svc)
 
     try:
@@ -35,17 +36,17 @@ async def ingest_naive(repo_urls: str) -> None:
     finally:
         # Finalize services
         cfg_svc.finalize()
-        repo_svc.finalize()
-        crawl_svc.finalize()
+        await repo_svc.finalize()
+        await crawl_svc.finalize()
         chunker_svc.finalize()
-        rag_svc.finalize()
+        await rag_svc.finalize()
 
 # define `ingest_lightrag` as a command processor to ingest into a RAG 
 # using LightRAG from a list of repository URLs.
 async def ingest_lightrag(repo_urls: str) -> None:
     # Initialize services
     cfg_svc = EnvVarsConfigService()
-    repo_svc = GithubRepoService(cfg_svc) if cfg_svc.get_repo_type() == "github" else GitlabRepoService(cfg_svc)
+    repo_svc = get_repo_service(cfg_svc)
     crawl_svc = AICrawlService(cfg_svc)
     rag_svc = LightRAGService(cfg_svc, crawl_svc)
 
@@ -53,32 +54,67 @@ async def ingest_lightrag(repo_urls: str) -> None:
         if not repo_urls:
             raise ValueError("No repo URLs provided. Please provide a comma-delimited list of repo URLs.")
 
-        md_urls = []
         repo_urls = repo_urls.split(',')
         print(f"Received the following repo URLs: {repo_urls}")
-        for repo_url in repo_urls:
-            md_urls.extend(await repo_svc.get_md_urls(repo_url.strip()))
-
-        print(f"Crawling the following md URLs: {md_urls}")
-        result = await rag_svc.ingest_md_urls(md_urls, ingest_progress_callback) 
+        if cfg_svc.get_repo_mode() == "archive" and cfg_svc.get_repo_type() != "local":
+            # One archive download per repo instead of listing and crawling every .md URL
+            md_docs = await repo_svc.get_all_md_docs(repo_urls)
+            result = await rag_svc.ingest_md_docs(md_docs, ingest_progress_callback)
+        else:
+            # Compare each repo head with the last ingest: when nothing moved
+            # there is nothing to crawl, otherwise the RAG skips unchanged docs
+            changes = await asyncio.gather(*[repo_svc.get_md_changes(repo_url.strip()) for repo_url in repo_urls])
+            if rag_svc.get_current_version() is not None and not any(change.has_changes for change in changes):
+                print("No repo changed since the last ingest - nothing to crawl")
+                result = []
+            else:
+                # Only added and modified docs are ingested: the new version starts
+                # from the current one, which holds the unchanged docs, and deleted
+                # docs are purged as they are no longer part of the corpus
+                corpus_urls = [url for change in changes for url in change.blobs]
+                if rag_svc.get_current_version() is None:
+                    changed_urls = set(corpus_urls)
+                else:
+                    changed_urls = {url for change in changes for url in change.added + change.modified}
+
+                if reads_md_docs(cfg_svc):
+                    # Local repos are read straight from disk, never crawled
+                    md_docs = await repo_svc.get_all_md_docs(repo_urls)
+                    md_docs = [doc for doc in md_docs if doc['url'] in changed_urls]
+                    result = await rag_svc.ingest_md_docs(md_docs, ingest_progress_callback, corpus_urls)
+                else:
+                    md_urls = [url for url in corpus_urls if url in changed_urls]
+
+                    print(f"Crawling the following md URLs: {md_urls}")
+                    result = await rag_svc.ingest_md_urls(md_urls, ingest_progress_callback, corpus_urls)
+
+                # Record a repo snapshot only once all of its changed docs were ingested:
+                # docs that failed to fetch or to insert are retried on the next run
+                ingested_urls = {r.source for r in result if not r.errors}
+                for change in changes:
+                    failed_urls = [url for url in change.blobs if url in changed_urls and url not in ingested_urls]
+                    if failed_urls:
+                        print(f"Not recording the snapshot of {change.repo_url} - {len(failed_urls)} docs failed and will be retried")
+                        continue
+                    repo_svc.save_md_changes(change)
         print(f"Successfully added docs to the configured RAG service: {result}")
     except Exception as e:
         print(f"Ingest error occurred: {e}")
     finally:
         # Finalize services
         cfg_svc.finalize()
-        repo_svc.finalize()
-        crawl_svc.finalize()
-        rag_svc.finalize()
+        await repo_svc.finalize()
+        await crawl_svc.finalize()
+        await rag_svc.finalize()
 
 # define `ingest_graphrag` as a command processor to ingest into a RAG 
 # using Graphrag from a list of repository URLs.
 async def ingest_graphrag(repo_urls: str) -> None:
     # Initialize services
     cfg_svc = EnvVarsConfigService()
-    repo_svc = GithubRepoService(cfg_svc) if cfg_svc.get_repo_type() == "github" else GitlabRepoService(cfg_svc)
+    repo_svc = get_repo_service(cfg_svc)
     crawl_svc = AICrawlService(cfg_svc)
-    chunker_svc = SemanticChunkerService(cfg_svc)
+    chunker_svc = get_chunker_service(cfg_svc)
     graph_svc = GraphitiGraphService(cfg_svc)
     rag_svc = GraphRAGService(cfg_svc, crawl_svc, chunker_svc, graph_svc)
 
@@ -86,25 +122,58 @@ async def ingest_graphrag(repo_urls: str) -> None:
         if not repo_urls:
             raise ValueError("No repo URLs provided. Please provide a comma-delimited list of repo URLs.")
 
-        md_urls = []
         repo_urls = repo_urls.split(',')
         print(f"Received the following repo URLs: {repo_urls}")
-        for repo_url in repo_urls:
-            md_urls.extend(await repo_svc.get_md_urls(repo_url.strip()))
-
-        print(f"Crawling the following md URLs: {md_urls}")
-        result = await rag_svc.ingest_md_urls(md_urls, ingest_progress_callback) 
+        if reads_md_docs(cfg_svc):
+            # One archive download (or local read) per repo instead of listing and crawling every .md URL
+            md_docs = await repo_svc.get_all_md_docs(repo_urls)
+            result = await rag_svc.ingest_md_docs(md_docs, ingest_progress_callback)
+        else:
+            # Start crawling each repo's md URLs as soon as the repo is discovered;
+            # a repo that fails to be discovered aborts before the graph is cleared
+            md_url_batches = repo_svc.iter_md_urls(repo_urls)
+            job_id = get_crawl_job_id(repo_urls, max_depth=1)
+            result = await rag_svc.ingest_md_url_batches(md_url_batches, job_id, ingest_progress_callback)
         print(f"Successfully added docs to the configured RAG service: {result}")
     except Exception as e:
         print(f"Ingest error occurred: {e}")
     finally:
         # Finalize services
         cfg_svc.finalize()
-        repo_svc.finalize()
-        crawl_svc.finalize()
+        await repo_svc.finalize()
+        await crawl_svc.finalize()
         chunker_svc.finalize()
         await graph_svc.finalize()
-        rag_svc.finalize()
+        await rag_svc.finalize()
+
+# define `rollback_lightrag` as a command processor to switch LightRAG
+# back to the previous version. The doc agent hot-reloads onto it.
+async def rollback_lightrag(_: str) -> None:
+    # Initialize services
+    cfg_svc = EnvVarsConfigService()
+    repo_svc = get_repo_service(cfg_svc)
+    crawl_svc = AICrawlService(cfg_svc)
+    rag_svc = LightRAGService(cfg_svc, crawl_svc)
+
+    try:
+        current_version = rag_svc.get_current_version()
+        version = rag_svc.rollback()
+        if version is None:
+            raise ValueError(f"No previous LightRAG version to roll back to from {current_version}.")
+
+        print(f"Rolled LightRAG back from version {current_version} to {version}")
+
+        # The repo snapshots describe the version rolled back from: forget them,
+        # so that the next ingest diffs every doc against the restored version
+        repo_svc.reset_md_changes()
+    except Exception as e:
+        print(f"Rollback error occurred: {e}")
+    finally:
+        # Finalize services
+        cfg_svc.finalize()
+        await repo_svc.finalize()
+        await crawl_svc.finalize()
+        await rag_svc.finalize()
 
 # define a command processors mapping where each key is a command name
 # and the value is an async function that performs the command. 
@@ -114,6 +183,7 @@ processors: Dict[str, Callable[..., Awaitable [None]]] = {
     "ingest_nv": ingest_naive,
     "ingest_lr": ingest_lightrag,
     "ingest_gr": ingest_graphrag,
+    "rollback_lr": rollback_lightrag,
 }
 
 async def main():
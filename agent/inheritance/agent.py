@@ -15,6 +15,7 @@ from helpers.visualizers import visualize_graph
 from service.config.envvars import EnvVarsConfigService
 from service.graph.typex import IGraphService
 from service.graph.neo4j import Neo4jGraphService
+from service.graph.neo4j_async import AsyncNeo4jGraphService
 
 from agent.typex import AgentParameters
 from .prompts import SYSTEM_PROMPT
@@ -38,7 +39,7 @@ async def initialize_agent_params() -> AgentParameters:
     await asyncio.sleep(0.1)
     # Initialize services
     cfg_svc = EnvVarsConfigService()
-    graph_svc = Neo4jGraphService(cfg_svc)
+    graph_svc = AsyncNeo4jGraphService(cfg_svc) if cfg_svc.get_neo4j_driver_type() == "async" else Neo4jGraphService(cfg_svc)
     deps = InhAgentDeps(graphsvc=graph_svc)
     return AgentParameters(
         title="Inheritance Agent",
@@ -52,6 +53,26 @@ async def finalize_agent_params(parameters: AgentParameters) -> None:
     """Finalize the agent dependencies."""
     await parameters.deps.graphsvc.finalize()
 
+# Run a query and transform its result into a graph for visualization.
+# The exposed driver is either the sync or the async Neo4j driver.
+async def _query_graph(graphsvc: IGraphService, query: str, params: Dict[str, Any]) -> Any:
+    driver = graphsvc.expose_driver()
+    if not driver:
+        raise ValueError("Graph service driver is not available.")
+
+    if isinstance(driver, neo4j.AsyncDriver):
+        return await driver.execute_query(
+            query,
+            params,
+            result_transformer_=neo4j.AsyncResult.graph
+        )
+
+    return driver.execute_query(
+        query,
+        params,
+        result_transformer_=neo4j.Result.graph
+    )
+
 @inh_agent.tool
 async def retrieve_persons(context: RunContext[InhAgentDeps]) -> List[Dict[str, Any]]:
     """Use this tool to retrieve max of 100 person nodes.
@@ -383,15 +404,7 @@ async def visualize_person_relationships(context: RunContext[InhAgentDeps], pers
         with open(node_attrs_file_path, "r") as f:
             node_attrs = json.load(f)
 
-        driver = context.deps.graphsvc.expose_driver()
-        if not driver:
-            raise ValueError("Graph service driver is not available.")
-
-        graph_result = driver.execute_query(
-            query,
-            params,
-            result_transformer_=neo4j.Result.graph
-        )
+        graph_result = await _query_graph(context.deps.graphsvc, query, params)
 
         # Draw graph
         output_path = f"{base_dir}/outputs/{person}_relationships.html"
@@ -762,15 +775,7 @@ async def visualize_property_relationships(context: RunContext[InhAgentDeps], pr
         with open(node_attrs_file_path, "r") as f:
             node_attrs = json.load(f)
 
-        driver = context.deps.graphsvc.expose_driver()
-        if not driver:
-            raise ValueError("Graph service driver is not available.")
-
-        graph_result = driver.execute_query(
-            query,
-            params,
-            result_transformer_=neo4j.Result.graph
-        )
+        graph_result = await _query_graph(context.deps.graphsvc, query, params)
 
         # Draw graph
         output_path = f"{base_dir}/outputs/{property}_relationships.html"
@@ -2,11 +2,12 @@ import sys
 import os
 import argparse
 import json
+import time
 import neo4j
 
-from typing import Dict, Callable, Awaitable, List
+from typing import Dict, Callable, Awaitable, List, Any
 from dotenv import load_dotenv
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 
 from helpers.visualizers import visualize_graph
 
@@ -17,6 +18,48 @@ from service.graph.neo4j import Neo4jGraphService
 
 load_dotenv()
 
+@dataclass
+class Person:
+    name: str
+    residence_country: str
+    residence_city: str
+    profession: str
+    gender: str
+    education: str
+    birth_city: str
+    birth_country: str
+    birth_day: str
+    birth_month: str
+    birth_year: str
+    death_city: str
+    death_country: str
+    death_day: str
+    death_month: str
+    death_year: str
+    photo: str
+    birth_certificate: str
+    death_certificate: str
+    inheritance_confinement: str
+    children: List[str] = field(default_factory=list)
+    spouses: List[str] = field(default_factory=list)
+
+@dataclass
+class Property:
+    name: str
+    lot: str
+    description: str
+    location: str
+    city: str
+    country: str
+    area: float
+    area_unit: str
+    shares: float
+    owner: str
+    possessed: bool
+    unsold: bool
+    organized: bool
+    effects: bool
+
 # define `ingest` as a command processor to ingest inheritance data.
 async def ingest(data_source: str) -> None:
     # Initialize services
@@ -37,31 +80,6 @@ async def ingest(data_source: str) -> None:
 
 # define `_ingest_persons` as a command processor to ingest persons inheritance data.
 async def _ingest_persons(_: IConfigService, graph_svc: IGraphService) -> None:
-    @dataclass
-    class Person:
-        name: str
-        residence_country: str
-        residence_city: str
-        profession: str
-        gender: str
-        education: str
-        birth_city: str
-        birth_country: str
-        birth_day: str
-        birth_month: str
-        birth_year: str
-        death_city: str
-        death_country: str
-        death_day: str
-        death_month: str
-        death_year: str
-        photo: str
-        birth_certificate: str
-        death_certificate: str
-        inheritance_confinement: str
-        children: List[str] = field(default_factory=list)
-        spouses: List[str] = field(default_factory=list)
-
     try:
         children: dict[str, list[str]] = {}
         spouses: dict[str, list[str]] = {}
@@ -441,23 +459,6 @@ async def _ingest_persons(_: IConfigService, graph_svc: IGraphService) -> None:
 
 # define `_ingest_properties` as a command processor to ingest properties data.
 async def _ingest_properties(_: IConfigService, graph_svc: IGraphService) -> None:
-    @dataclass
-    class Property:
-        name: str
-        lot: str
-        description: str
-        location: str
-        city: str
-        country: str
-        area: float
-        area_unit: str
-        shares: float
-        owner: str
-        possessed: bool
-        unsold: bool
-        organized: bool
-        effects: bool
-
     try:
         owners : dict[str, str] = {}
         countries : dict[str, str] = {}
@@ -622,6 +623,205 @@ async def _ingest_properties(_: IConfigService, graph_svc: IGraphService) -> Non
     except Exception as e:
         print(f"Ingest properties error occurred: {e}")
 
+# define `ingest_bulk` as a command processor to ingest inheritance data
+# in bulk. Each node/edge kind is grouped into a parameter list and written 
+# with `UNWIND` in batches of `NEO4J_BATCH_SIZE` rows per transaction.
+async def ingest_bulk(data_source: str) -> None:
+    # Initialize services
+    cfg_svc = EnvVarsConfigService()
+    graph_svc = Neo4jGraphService(cfg_svc)
+
+    try:
+        await graph_svc.clear_graph()
+
+        # MERGE on an unindexed label scans all nodes per row
+        for label in ["Person", "Country", "City", "Property"]:
+            await graph_svc.query(
+                f"CREATE INDEX {label.lower()}_name IF NOT EXISTS FOR (n:{label}) ON (n.name)"
+            )
+
+        await _bulk_ingest_persons(cfg_svc, graph_svc)
+        await _bulk_ingest_properties(cfg_svc, graph_svc)
+    except Exception as e:
+        print(f"Ingest error occurred: {e}")
+    finally:
+        # Finalize services
+        cfg_svc.finalize()
+        await graph_svc.finalize()
+
+# define `_bulk_write` to write a single phase and report its throughput.
+async def _bulk_write(cfg_svc: IConfigService, graph_svc: IGraphService, phase: str, query: str, rows: List[Dict[str, Any]]) -> None:
+    start_time = time.perf_counter()
+    try:
+        written = await graph_svc.query_batch(query, rows, cfg_svc.get_neo4j_batch_size())
+    except Exception as e:
+        print(f"Error processing {phase} batch: {e}")
+        return
+
+    elapsed = time.perf_counter() - start_time
+    rate = written / elapsed if elapsed > 0 else 0.0
+    print(f"Bulk {phase}: {written} rows in {elapsed:.2f}s ({rate:.0f} rows/s)")
+
+# define `_bulk_ingest_persons` as a command processor to bulk ingest persons inheritance data.
+async def _bulk_ingest_persons(cfg_svc: IConfigService, graph_svc: IGraphService) -> None:
+    try:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+
+        persons_file_path = os.path.join(base_dir, "data", "persons.json")
+
+        # load persons
+        with open(persons_file_path, "r") as f:
+            persons = [Person(**person_data) for person_data in json.load(f)]
+
+        def known(value: str) -> bool:
+            return bool(value) and value != "n/a"
+
+        person_rows = []
+        countries = set()
+        cities = set()
+        countrycities = set()
+        edges: dict[str, list[dict[str, str]]] = {
+            "parent_of": [],
+            "spouse_of": [],
+            "resident_of_city": [],
+            "resident_of_country": [],
+            "born_in_city": [],
+            "born_in_country": [],
+            "died_in_city": [],
+            "died_in_country": [],
+        }
+
+        for person in persons:
+            props = asdict(person)
+            props.pop("children")
+            props.pop("spouses")
+            person_rows.append(props)
+
+            edges["parent_of"].extend({"from": person.name, "to": child} for child in person.children)
+            edges["spouse_of"].extend({"from": person.name, "to": spouse} for spouse in person.spouses)
+
+            for kind, country, city in [
+                ("resident_of", person.residence_country, person.residence_city),
+                ("born_in", person.birth_country, person.birth_city),
+                ("died_in", person.death_country, person.death_city),
+            ]:
+                if known(country):
+                    countries.add(country)
+                    edges[f"{kind}_country"].append({"from": person.name, "to": country})
+
+                if known(city):
+                    cities.add(city)
+                    edges[f"{kind}_city"].append({"from": person.name, "to": city})
+                    countrycities.add((country, city))
+
+        await _bulk_write(cfg_svc, graph_svc, "persons", """
+            UNWIND $rows AS row
+            MERGE (p:Person {name: row.name})
+            SET p += row
+        """, person_rows)
+
+        await _bulk_write(cfg_svc, graph_svc, "countries", """
+            UNWIND $rows AS row
+            MERGE (:Country {name: row.name})
+        """, [{"name": country} for country in countries])
+
+        await _bulk_write(cfg_svc, graph_svc, "cities", """
+            UNWIND $rows AS row
+            MERGE (:City {name: row.name})
+        """, [{"name": city} for city in cities])
+
+        await _bulk_write(cfg_svc, graph_svc, "country-city", """
+            UNWIND $rows AS row
+            MATCH (c:Country {name: row.country}), (ci:City {name: row.city})
+            MERGE (c)-[:HAS_CITY]->(ci)
+            MERGE (ci)-[:HAS_COUNTRY]->(c)
+        """, [{"country": country, "city": city} for country, city in countrycities])
+
+        # relationship types cannot be parameterized, so each kind gets its own query
+        edge_queries = {
+            "parent_of": ("Person", "PARENT_OF", "Person"),
+            "spouse_of": ("Person", "SPOUSE_OF", "Person"),
+            "resident_of_city": ("Person", "RESIDENT_OF", "City"),
+            "resident_of_country": ("Person", "RESIDENT_OF", "Country"),
+            "born_in_city": ("Person", "BORN_IN", "City"),
+            "born_in_country": ("Person", "BORN_IN", "Country"),
+            "died_in_city": ("Person", "DIED_IN", "City"),
+            "died_in_country": ("Person", "DIED_IN", "Country"),
+        }
+
+        for phase, (from_label, rel_type, to_label) in edge_queries.items():
+            await _bulk_write(cfg_svc, graph_svc, phase, f"""
+                UNWIND $rows AS row
+                MATCH (a:{from_label} {{name: row.from}}), (b:{to_label} {{name: row.to}})
+                MERGE (a)-[:{rel_type}]->(b)
+            """, edges[phase])
+
+        # query the database
+        query = """
+            MATCH (p:Person)
+            RETURN count(p) AS persons
+        """
+        records = await graph_svc.query(query)
+        print(f"Persons Query '{query}' returned {records}")
+    except Exception as e:
+        print(f"Bulk ingest persons error occurred: {e}")
+
+# define `_bulk_ingest_properties` as a command processor to bulk ingest properties data.
+async def _bulk_ingest_properties(cfg_svc: IConfigService, graph_svc: IGraphService) -> None:
+    try:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+
+        properties_file_path = os.path.join(base_dir, "data", "properties.json")
+
+        # load properties
+        with open(properties_file_path, "r") as f:
+            properties = [Property(**prop_data) for prop_data in json.load(f)]
+
+        def known(value: str) -> bool:
+            return bool(value) and value != "n/a"
+
+        property_rows = [asdict(property) for property in properties]
+        owners = [{"from": p.name, "to": p.owner} for p in properties if known(p.owner)]
+        countries = [{"from": p.name, "to": p.country} for p in properties if known(p.country)]
+        cities = [{"from": p.name, "to": p.city} for p in properties if known(p.city)]
+
+        await _bulk_write(cfg_svc, graph_svc, "properties", """
+            UNWIND $rows AS row
+            MERGE (p:Property {name: row.name})
+            SET p += row
+        """, property_rows)
+
+        await _bulk_write(cfg_svc, graph_svc, "property-owner", """
+            UNWIND $rows AS row
+            MATCH (p:Property {name: row.from}), (o:Person {name: row.to})
+            MERGE (p)-[:OWNED_BY]->(o)
+            MERGE (o)-[:OWNS]->(p)
+        """, owners)
+
+        await _bulk_write(cfg_svc, graph_svc, "property-country", """
+            UNWIND $rows AS row
+            MATCH (p:Property {name: row.from}), (c:Country {name: row.to})
+            MERGE (p)-[:LOCATED_IN]->(c)
+            MERGE (c)-[:HAS_PROPERTY]->(p)
+        """, countries)
+
+        await _bulk_write(cfg_svc, graph_svc, "property-city", """
+            UNWIND $rows AS row
+            MATCH (p:Property {name: row.from}), (c:City {name: row.to})
+            MERGE (p)-[:LOCATED_IN]->(c)
+            MERGE (c)-[:HAS_PROPERTY]->(p)
+        """, cities)
+
+        # query the database
+        query = """
+            MATCH (p:Property)
+            RETURN count(p) AS properties
+        """
+        records = await graph_svc.query(query)
+        print(f"Properties Query '{query}' returned {records}")
+    except Exception as e:
+        print(f"Bulk ingest properties error occurred: {e}")
+
 # define `visualize` as a command processor to visualize queried data.
 async def visualize(query_name: str) -> None:
     # Initialize services
@@ -683,6 +883,7 @@ async def visualize(query_name: str) -> None:
 # input arguments, returns None and must be awaited. 
 processors: Dict[str, Callable[..., Awaitable [None]]] = {
     "ingest": ingest,
+    "ingest_bulk": ingest_bulk,
     "visualize": visualize
 }
 
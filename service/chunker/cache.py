@@ -0,0 +1,55 @@
+from typing import List, Optional
+import os
+import json
+import time
+import sqlite3
+import hashlib
+
+from .typex import SplitCacheStats
+
+def get_split_key(section: str, chunk_size: int, max_chunk_size: int, model: str) -> str:
+    """Derive the cache key of a section split from its text and the split parameters."""
+    key = json.dumps([chunk_size, max_chunk_size, model, section], ensure_ascii=False)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+# on-disk cache of LLM section splits backed by a single SQLite file.
+# splits are content-addressed i.e. keyed by the hash of the section text
+# and the split parameters, so re-ingesting unchanged docs reuses them
+# instead of paying for the LLM calls again.
+class SplitCache:
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "split_cache.db"))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS splits (
+                key TEXT PRIMARY KEY,
+                chunks TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+        self.stats = SplitCacheStats()
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """Get the cached sub-chunks of a section split."""
+        row = self.conn.execute("SELECT chunks FROM splits WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, chunks: List[str]) -> None:
+        """Store the sub-chunks of a section split."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO splits (key, chunks, created_at) VALUES (?, ?, ?)",
+            (key, json.dumps(chunks, ensure_ascii=False), time.time())
+        )
+        self.conn.commit()
+
+    def record_hit(self) -> None:
+        """Record a split served from disk i.e. an LLM call avoided."""
+        self.stats.hits += 1
+
+    def record_miss(self) -> None:
+        """Record a split that needed an LLM call."""
+        self.stats.misses += 1
+
+    def close(self) -> None:
+        self.conn.close()
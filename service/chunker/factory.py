@@ -0,0 +1,18 @@
+from typing import Callable, Dict
+
+from service.config.typex import IConfigService
+from .typex import IChunkerService
+from .semantic import SemanticChunkerService
+from .simple import SimpleChunkerService
+from .lexical import LexicalChunkerService
+
+# dictionary to map chunker types to a callable function that returns a chunker service
+_CHUNKER_SERVICES: Dict[str, Callable[[IConfigService], IChunkerService]] = {
+    "semantic": SemanticChunkerService,
+    "simple": SimpleChunkerService,
+    "lexical": LexicalChunkerService
+}
+
+def get_chunker_service(config_service: IConfigService) -> IChunkerService:
+    """Get the chunker service of the configured chunker type. Defaults to semantic."""
+    return _CHUNKER_SERVICES.get(config_service.get_chunker_type(), SemanticChunkerService)(config_service)
@@ -0,0 +1,229 @@
+from typing import List, Dict, Any, Optional, Iterator
+from itertools import chain
+import re
+import zlib
+
+import numpy as np
+
+from service.config.typex import IConfigService
+from .typex import DocumentChunk, SplitCacheStats
+from .spans import Span, strip_span, iter_window_spans
+
+# sentence ends, blank lines and line breaks before markdown headers
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+|\n\s*\n|\n(?=#{1,6}\s)')
+# word tokens
+_TOKEN = re.compile(r'\w{2,}')
+# dimension of the hashed bag-of-words vectors
+_N_FEATURES = 4096
+
+class _FeatureIds(dict):
+    """Memoized stable hashing of tokens into feature ids."""
+    def __missing__(self, token: str) -> int:
+        feature = self[token] = zlib.crc32(token.lower().encode("utf-8")) % _N_FEATURES
+        return feature
+
+# compliant with IChunkerService protocol
+# this service finds topic boundaries locally, without any LLM or embedding call.
+# sentences are vectorized as hashed TF-IDF bags of words with NumPy, and the
+# document is cut where the cosine similarity between the sentence windows
+# before and after a gap drops well below the document average (TextTiling).
+class LexicalChunkerService:
+    def __init__(self, config_service: IConfigService):
+        self.config_service = config_service
+        self.config = config_service.get_chunking_config()
+
+    def finalize(self) -> None:
+        """Destruct the service and close resources."""
+        return None
+
+    def get_cache_stats(self) -> SplitCacheStats:
+        """No LLM splits, so nothing is cached."""
+        return SplitCacheStats()
+
+    async def chunk_document(
+        self,
+        content: str,
+        title: str,
+        source: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[DocumentChunk]:
+        """Chunk a document at its lexical topic boundaries."""
+        return self.split_document(content, title, source, metadata)
+
+    def split_document(
+        self,
+        content: str,
+        title: str,
+        source: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[DocumentChunk]:
+        """
+        Chunk a document at its lexical topic boundaries, synchronously.
+
+        Args:
+            content: Document content
+            title: Document title
+            source: Document source
+            metadata: Additional metadata
+
+        Returns:
+            List of document chunks
+        """
+        if not content.strip():
+            return []
+
+        base_metadata = {
+            "title": title,
+            "source": source,
+            "chunk_method": "lexical",
+            **(metadata or {})
+        }
+
+        spans = self.get_chunk_spans(content)
+        return [
+            DocumentChunk(
+                content=content[start_pos:end_pos],
+                index=i,
+                start_char=start_pos,
+                end_char=end_pos,
+                metadata={**base_metadata, "total_chunks": len(spans)}
+            )
+            for i, (start_pos, end_pos) in enumerate(spans)
+        ]
+
+    def get_chunk_spans(self, content: str) -> List[Span]:
+        """
+        Get the chunk spans of a document.
+
+        Args:
+            content: Document content
+
+        Returns:
+            List of chunk spans
+        """
+        units = list(self._iter_sentence_spans(content))
+        if len(units) < 2:
+            return units
+
+        similarities = self._get_gap_similarities(content, units)
+        return self._group_sentences(units, similarities)
+
+    def _iter_sentence_spans(self, content: str) -> Iterator[Span]:
+        """Yield the spans of the sentences of a document, windowing the ones longer than a chunk."""
+        pos = 0
+        for match in _SENTENCE_BREAK.finditer(content):
+            yield from self._iter_sentence_span(content, pos, match.start())
+            pos = match.end()
+        yield from self._iter_sentence_span(content, pos, len(content))
+
+    def _iter_sentence_span(self, content: str, start: int, end: int) -> Iterator[Span]:
+        start, end = strip_span(content, start, end)
+        if start >= end:
+            return
+        if end - start <= self.config.chunk_size:
+            yield start, end
+            return
+
+        for window_start, window_end in iter_window_spans(content, self.config.chunk_size, 0, self.config.min_chunk_size, start, end):
+            window_start, window_end = strip_span(content, window_start, window_end)
+            if window_start < window_end:
+                yield window_start, window_end
+
+    def _get_gap_similarities(self, content: str, units: List[Span]) -> np.ndarray:
+        """
+        Compute the cosine similarity across every gap between sentences.
+        similarities[g] compares the window of sentences ending before sentence g
+        with the window starting at it; similarities[0] is unused.
+        Window vectors are never materialized: window dot products and norms are
+        sums of sentence-pair dot products, taken from prefix sums of the band of
+        the sentence Gram matrix, so the cost is linear in the number of terms.
+        """
+        n_units = len(units)
+        window = max(1, self.config.lexical_window_sentences)
+
+        # Hash the tokens of every sentence into sorted unique (sentence, feature) keys
+        unit_tokens = [_TOKEN.findall(content, start, end) for start, end in units]
+        features = list(map(_FeatureIds().__getitem__, chain.from_iterable(unit_tokens)))
+        rows = np.repeat(np.arange(n_units, dtype=np.int64), [len(tokens) for tokens in unit_tokens])
+        keys, term_counts = np.unique(rows * _N_FEATURES + np.asarray(features, dtype=np.int64), return_counts=True)
+        if not len(keys):
+            return np.zeros(n_units)
+        pair_rows = keys // _N_FEATURES
+        pair_features = keys % _N_FEATURES
+
+        # Sublinear TF weighted by the smoothed IDF of the document sentences
+        doc_freqs = np.bincount(pair_features, minlength=_N_FEATURES)
+        idf = np.log((1 + n_units) / (1 + doc_freqs)) + 1
+        weights = (1 + np.log(term_counts)) * idf[pair_features]
+
+        # prefixes[k][i] sums the dot products of sentences j and j + k for j < i
+        prefixes = []
+        for offset in range(2 * window):
+            shifted = keys + offset * _N_FEATURES
+            matches = np.minimum(np.searchsorted(keys, shifted), len(keys) - 1)
+            matched = keys[matches] == shifted
+            band = np.bincount(pair_rows[matched], weights=weights[matched] * weights[matches[matched]], minlength=n_units)
+            prefixes.append(np.concatenate(([0.0], np.cumsum(band))))
+
+        def _sum(offset: int, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+            hi = np.maximum(hi, lo)
+            return prefixes[offset][hi] - prefixes[offset][lo]
+
+        gaps = np.arange(1, n_units)
+        before_lo = np.maximum(gaps - window, 0)
+        after_hi = np.minimum(gaps + window, n_units)
+
+        dots = np.zeros(len(gaps))
+        before_norms = _sum(0, before_lo, gaps)
+        after_norms = _sum(0, gaps, after_hi)
+        for offset in range(1, 2 * window):
+            # Pairs straddling the gap
+            dots += _sum(offset, np.maximum(before_lo, gaps - offset), np.minimum(gaps, after_hi - offset))
+            # Pairs within each window
+            if offset < window:
+                before_norms += 2 * _sum(offset, before_lo, gaps - offset)
+                after_norms += 2 * _sum(offset, gaps, after_hi - offset)
+
+        norms = np.sqrt(before_norms * after_norms)
+        similarities = np.ones(n_units)
+        similarities[1:] = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+        return similarities
+
+    def _group_sentences(self, units: List[Span], similarities: np.ndarray) -> List[Span]:
+        """
+        Group sentences into chunks, cutting at the similarity drops that leave
+        chunks of at least `min_chunk_size` characters. A chunk about to exceed
+        `chunk_size` is cut at its lowest-similarity gap instead.
+        """
+        n_units = len(units)
+        starts = np.fromiter((start for start, _ in units), dtype=np.int64, count=n_units)
+        ends = np.fromiter((end for _, end in units), dtype=np.int64, count=n_units)
+
+        # Drops are local minima well below the average similarity
+        gap_similarities = similarities[1:]
+        threshold = gap_similarities.mean() - self.config.lexical_drop_stddevs * gap_similarities.std()
+        padded = np.concatenate(([np.inf], gap_similarities, [np.inf]))
+        is_drop = np.zeros(n_units, dtype=bool)
+        is_drop[1:] = (gap_similarities < threshold) & (gap_similarities <= padded[:-2]) & (gap_similarities <= padded[2:])
+
+        spans = []
+        first = 0
+        for gap in range(1, n_units):
+            if ends[gap] - starts[first] > self.config.chunk_size:
+                # Cut at the weakest gap that keeps both sides within bounds
+                gaps = np.arange(first + 1, gap + 1)
+                candidates = gaps[
+                    (ends[gaps - 1] - starts[first] >= self.config.min_chunk_size) &
+                    (ends[gap] - starts[gaps] <= self.config.chunk_size)
+                ]
+                cut = int(candidates[np.argmin(similarities[candidates])]) if len(candidates) else gap
+            elif is_drop[gap] and ends[gap - 1] - starts[first] >= self.config.min_chunk_size:
+                cut = gap
+            else:
+                continue
+
+            spans.append((int(starts[first]), int(ends[cut - 1])))
+            first = cut
+
+        spans.append((int(starts[first]), int(ends[-1])))
+        return spans
@@ -0,0 +1,101 @@
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import os
+import asyncio
+import multiprocessing
+
+from service.config.typex import IConfigService
+from .typex import IChunkerService, ICPUChunkerService, DocumentChunk
+
+# chunker installed in every worker process
+_worker_chunker: Optional[ICPUChunkerService] = None
+
+def _init_worker(chunker_service: ICPUChunkerService) -> None:
+    global _worker_chunker
+    _worker_chunker = chunker_service
+
+def _split_document(content: str, title: str, source: str, metadata: Optional[Dict[str, Any]]) -> List[DocumentChunk]:
+    return _worker_chunker.split_document(content, title, source, metadata)
+
+def get_available_cores() -> int:
+    """Get the number of cores this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+# parallel chunking front end.
+# CPU-bound chunkers (see ICPUChunkerService) chunk documents in a process
+# pool sized to the available cores, so that regex splits and boundary scans
+# run off the event loop while the loop keeps doing embedding, graph and LLM
+# work. Documents are chunked ahead of their consumer and streamed back in
+# order. Other chunkers (i.e. LLM-bound semantic chunking) are awaited on
+# the loop as before.
+class ParallelChunker:
+    def __init__(self, config_service: IConfigService, chunker_service: IChunkerService):
+        self.config_service = config_service
+        self.chunker_service = chunker_service
+        self.max_workers = config_service.get_chunk_max_workers() or get_available_cores()
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    async def iter_chunked_docs(
+            self,
+            docs: AsyncIterator[Dict[str, str]],
+            metadata: Optional[Dict[str, Any]] = None) -> AsyncIterator[Tuple[Dict[str, str], List[DocumentChunk]]]:
+        """
+        Chunk {url, markdown} docs as they arrive, keeping up to twice the workers in flight.
+
+        Args:
+            docs: Documents to chunk
+            metadata: Additional metadata of every chunk
+
+        Yields:
+            Every document with its chunks, in document order.
+            Documents without markdown come with no chunks.
+        """
+        pending = deque()
+        try:
+            async for doc in docs:
+                pending.append((doc, asyncio.ensure_future(self._chunk_doc(doc, metadata))))
+                if len(pending) >= 2 * self.max_workers:
+                    doc, task = pending.popleft()
+                    yield doc, await task
+
+            while pending:
+                doc, task = pending.popleft()
+                yield doc, await task
+        finally:
+            # Cancel the chunking of docs that were never consumed
+            for _, task in pending:
+                task.cancel()
+
+    def finalize(self) -> None:
+        """Destruct the front end and shut the worker processes down."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def _chunk_doc(self, doc: Dict[str, str], metadata: Optional[Dict[str, Any]]) -> List[DocumentChunk]:
+        url = doc['url']
+        md = doc['markdown']
+        if not md:
+            return []
+
+        if not isinstance(self.chunker_service, ICPUChunkerService):
+            return await self.chunker_service.chunk_document(content=md, title=url, source=url, metadata=metadata)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), _split_document, md, url, url, metadata)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Lazy-load the process pool, installing the chunker in every worker once
+        # Workers are spawned, never forked: the parent runs an event loop and
+        # HTTP, Neo4j and browser threads whose locks a fork could copy held
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.chunker_service,)
+            )
+        return self.executor
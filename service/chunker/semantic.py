@@ -1,8 +1,17 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+import re
+import asyncio
+
+from pydantic_ai import Agent
 
 from service.config.typex import IConfigService
 from helpers.providers import get_embedding_client, get_ingestion_model
-from .typex import DocumentChunk
+from .typex import DocumentChunk, SplitCacheStats
+from .cache import SplitCache, get_split_key
+from .spans import Span, strip_span, iter_window_spans
+
+# a chunk text with its (start, end) offsets in the document
+LocatedChunk = Tuple[str, int, int]
 
 # compliant with IChunkerService protocol
 class SemanticChunkerService:
@@ -16,7 +25,21 @@ class SemanticChunkerService:
         self.config = config_service.get_chunking_config()
         self.client = get_embedding_client()
         self.model = get_ingestion_model()
+        self.split_semaphore = asyncio.Semaphore(self.config.max_concurrent_splits)
+        self.splitter_agent = None
+        # content-addressed cache of LLM section splits (disabled if no dir)
+        cache_dir = config_service.get_chunk_cache_dir()
+        self.split_cache: Optional[SplitCache] = SplitCache(cache_dir) if cache_dir else None
     
+    def finalize(self) -> None:
+        """Destruct the service and close resources."""
+        if self.split_cache is not None:
+            self.split_cache.close()
+
+    def get_cache_stats(self) -> SplitCacheStats:
+        """Get semantic split cache statistics."""
+        return self.split_cache.stats if self.split_cache else SplitCacheStats()
+
     async def chunk_document(
         self,
         content: str,
@@ -52,7 +75,6 @@ class SemanticChunkerService:
                 if semantic_chunks:
                     return self._create_chunk_objects(
                         semantic_chunks,
-                        content,
                         base_metadata
                     )
             except Exception as e:
@@ -61,7 +83,7 @@ class SemanticChunkerService:
         # Fallback to rule-based chunking
         return self._simple_chunk(content, base_metadata)
     
-    async def _semantic_chunk(self, content: str) -> List[str]:
+    async def _semantic_chunk(self, content: str) -> List[LocatedChunk]:
         """
         Perform semantic chunking using LLM.
         
@@ -69,42 +91,53 @@ class SemanticChunkerService:
             content: Content to chunk
         
         Returns:
-            List of chunk boundaries
+            List of chunks with their offsets
         """
         # First, split on natural boundaries
         sections = self._split_on_structure(content)
         
-        # Group sections into semantic chunks
-        chunks = []
-        current_chunk = ""
+        # Group sections into semantic chunks by offset.
+        # every group holds the chunks of one grouped span or one oversized section
+        groups: List[List[LocatedChunk]] = []
+        oversized: List[Tuple[int, int, int]] = []
+        current_span = None
         
-        for section in sections:
+        for start, end in sections:
             # Check if adding this section would exceed chunk size
-            potential_chunk = current_chunk + "\n\n" + section if current_chunk else section
+            chunk_start = current_span[0] if current_span else start
             
-            if len(potential_chunk) <= self.config.chunk_size:
-                current_chunk = potential_chunk
+            if end - chunk_start <= self.config.chunk_size:
+                current_span = (chunk_start, end)
             else:
                 # Current chunk is ready, decide if we should split the section
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                    current_chunk = ""
+                if current_span:
+                    groups.append([self._get_located_chunk(content, *current_span)])
+                    current_span = None
                 
                 # Handle oversized sections
-                if len(section) > self.config.max_chunk_size:
-                    # Split the section semantically
-                    sub_chunks = await self._split_long_section(section)
-                    chunks.extend(sub_chunks)
+                if end - start > self.config.max_chunk_size:
+                    # Reserve the group of the section, split once all sections are grouped
+                    oversized.append((len(groups), start, end))
+                    groups.append([])
                 else:
-                    current_chunk = section
+                    current_span = (start, end)
         
         # Add the last chunk
-        if current_chunk:
-            chunks.append(current_chunk.strip())
+        if current_span:
+            groups.append([self._get_located_chunk(content, *current_span)])
+        
+        # Split the oversized sections semantically, all at once
+        split_sections = await asyncio.gather(*(
+            self._split_long_section(content[start:end]) for _, start, end in oversized
+        ))
+        for (group_index, start, end), sub_chunks in zip(oversized, split_sections):
+            groups[group_index] = self._locate_sub_chunks(content, start, end, sub_chunks)
         
-        return [chunk for chunk in chunks if len(chunk.strip()) >= self.config.min_chunk_size]
+        # Flatten the groups in document order
+        chunks = [chunk for group in groups for chunk in group]
+        return [chunk for chunk in chunks if len(chunk[0].strip()) >= self.config.min_chunk_size]
     
-    def _split_on_structure(self, content: str) -> List[str]:
+    def _split_on_structure(self, content: str) -> List[Span]:
         """
         Split content on structural boundaries.
         
@@ -112,7 +145,7 @@ class SemanticChunkerService:
             content: Content to split
         
         Returns:
-            List of sections
+            List of section spans
         """
         # Split on markdown headers, paragraphs, and other structural elements
         patterns = [
@@ -124,18 +157,29 @@ class SemanticChunkerService:
             r'\n\|\s*.+?\|\s*\n', # Tables
         ]
         
-        # Split by patterns but keep the separators
-        sections = [content]
+        # Split by patterns but keep the separators, tracking offsets instead of copying text
+        sections = [(0, len(content))]
         
         for pattern in patterns:
+            regex = re.compile(pattern, flags=re.MULTILINE | re.DOTALL)
             new_sections = []
-            for section in sections:
-                parts = re.split(f'({pattern})', section, flags=re.MULTILINE | re.DOTALL)
-                new_sections.extend([part for part in parts if part.strip()])
+            for start, end in sections:
+                pos = start
+                for match in regex.finditer(content, start, end):
+                    self._append_section(new_sections, content, pos, match.start())
+                    self._append_section(new_sections, content, match.start(), match.end())
+                    pos = match.end()
+                self._append_section(new_sections, content, pos, end)
             sections = new_sections
         
         return sections
     
+    def _append_section(self, sections: List[Span], content: str, start: int, end: int) -> None:
+        """Append a section span unless it is blank."""
+        stripped_start, stripped_end = strip_span(content, start, end)
+        if stripped_start < stripped_end:
+            sections.append((start, end))
+    
     async def _split_long_section(self, section: str) -> List[str]:
         """
         Split a long section using LLM for semantic boundaries.
@@ -147,6 +191,15 @@ class SemanticChunkerService:
             List of sub-chunks
         """
         try:
+            # Reuse the split of an identical section, if any
+            split_key = get_split_key(section, self.config.chunk_size, self.config.max_chunk_size, self.model.model_name)
+            if self.split_cache:
+                cached_chunks = self.split_cache.get(split_key)
+                if cached_chunks is not None:
+                    self.split_cache.record_hit()
+                    return cached_chunks
+                self.split_cache.record_miss()
+            
             prompt = f"""
             Split the following text into semantically coherent chunks. Each chunk should:
             1. Be roughly {self.config.chunk_size} characters long
@@ -160,11 +213,9 @@ class SemanticChunkerService:
             {section}
             """
             
-            # Use Pydantic AI for LLM calls
-            from pydantic_ai import Agent
-            temp_agent = Agent(self.model)
-            
-            response = await temp_agent.run(prompt)
+            # Use Pydantic AI for LLM calls, bounding the concurrent splits
+            async with self.split_semaphore:
+                response = await self._get_splitter_agent().run(prompt)
             result = response.data
             chunks = [chunk.strip() for chunk in result.split("---CHUNK---")]
             
@@ -174,12 +225,23 @@ class SemanticChunkerService:
                 if (self.config.min_chunk_size <= len(chunk) <= self.config.max_chunk_size):
                     valid_chunks.append(chunk)
             
-            return valid_chunks if valid_chunks else self._simple_split(section)
+            if not valid_chunks:
+                return self._simple_split(section)
+            
+            if self.split_cache:
+                self.split_cache.put(split_key, valid_chunks)
+            return valid_chunks
             
         except Exception as e:
             print(f"LLM chunking failed: {e}")
             return self._simple_split(section)
     
+    def _get_splitter_agent(self) -> Agent:
+        # Lazy-load the splitter agent, shared by all splits
+        if self.splitter_agent is None:
+            self.splitter_agent = Agent(self.model)
+        return self.splitter_agent
+    
     def _simple_split(self, text: str) -> List[str]:
         """
         Simple text splitting as fallback.
@@ -190,28 +252,16 @@ class SemanticChunkerService:
         Returns:
             List of chunks
         """
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + self.config.chunk_size
-            
-            if end >= len(text):
-                # Last chunk
-                chunks.append(text[start:])
-                break
-            
-            # Try to end at a sentence boundary
-            chunk_end = end
-            for i in range(end, max(start + self.config.min_chunk_size, end - 200), -1):
-                if text[i] in '.!?\n':
-                    chunk_end = i + 1
-                    break
-            
-            chunks.append(text[start:chunk_end])
-            start = chunk_end - self.config.chunk_overlap
-        
-        return chunks
+        return [text[start:end] for start, end in self._iter_window_spans(text)]
+    
+    def _iter_window_spans(self, text: str) -> Iterator[Span]:
+        """Slide the chunk window over text."""
+        return iter_window_spans(
+            text,
+            self.config.chunk_size,
+            self.config.chunk_overlap,
+            self.config.min_chunk_size
+        )
     
     def _simple_chunk(
         self,
@@ -228,38 +278,70 @@ class SemanticChunkerService:
         Returns:
             List of document chunks
         """
-        chunks = self._simple_split(content)
-        return self._create_chunk_objects(chunks, content, base_metadata)
+        chunks = [(content[start:end], start, end) for start, end in self._iter_window_spans(content)]
+        return self._create_chunk_objects(chunks, base_metadata)
+    
+    def _get_located_chunk(self, content: str, start: int, end: int) -> LocatedChunk:
+        """Get the chunk of a span, without its surrounding whitespace."""
+        start, end = strip_span(content, start, end)
+        return content[start:end], start, end
+    
+    def _locate_sub_chunks(
+        self,
+        content: str,
+        section_start: int,
+        section_end: int,
+        sub_chunks: List[str]
+    ) -> List[LocatedChunk]:
+        """
+        Locate the sub-chunks of a section split by the LLM.
+        Sub-chunks come in document order, so each one is only searched for
+        right after the previous one; a sub-chunk the LLM did not return
+        verbatim is placed at the estimated position.
+        
+        Args:
+            content: Original document content
+            section_start: Start of the section in the document
+            section_end: End of the section in the document
+            sub_chunks: Sub-chunk texts
+        
+        Returns:
+            List of sub-chunks with their offsets
+        """
+        located = []
+        cursor = section_start
+        
+        for sub_chunk in sub_chunks:
+            search_end = min(section_end, cursor + len(sub_chunk) + self.config.max_chunk_size)
+            start_pos = content.find(sub_chunk, cursor, search_end)
+            if start_pos == -1:
+                # Fallback: estimate position
+                start_pos = min(cursor, section_end)
+            
+            end_pos = min(start_pos + len(sub_chunk), section_end)
+            located.append((sub_chunk, start_pos, end_pos))
+            cursor = end_pos
+        
+        return located
     
     def _create_chunk_objects(
         self,
-        chunks: List[str],
-        original_content: str,
+        chunks: List[LocatedChunk],
         base_metadata: Dict[str, Any]
     ) -> List[DocumentChunk]:
         """
-        Create DocumentChunk objects from text chunks.
+        Create DocumentChunk objects from located text chunks.
         
         Args:
-            chunks: List of chunk texts
-            original_content: Original document content
+            chunks: List of chunk texts with their offsets
             base_metadata: Base metadata
         
         Returns:
             List of DocumentChunk objects
         """
         chunk_objects = []
-        current_pos = 0
         
-        for i, chunk_text in enumerate(chunks):
-            # Find the position of this chunk in the original content
-            start_pos = original_content.find(chunk_text, current_pos)
-            if start_pos == -1:
-                # Fallback: estimate position
-                start_pos = current_pos
-            
-            end_pos = start_pos + len(chunk_text)
-            
+        for i, (chunk_text, start_pos, end_pos) in enumerate(chunks):
             # Create chunk metadata
             chunk_metadata = {
                 **base_metadata,
@@ -274,9 +356,5 @@ class SemanticChunkerService:
                 end_char=end_pos,
                 metadata=chunk_metadata
             ))
-            
-            current_pos = end_pos
         
         return chunk_objects
-
-
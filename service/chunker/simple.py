@@ -1,7 +1,8 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 
 from service.config.typex import IConfigService
-from .typex import DocumentChunk
+from .typex import DocumentChunk, SplitCacheStats
+from .spans import iter_paragraph_chunk_spans
 
 # compliant with IChunkerService protocol
 class SimpleChunkerService:
@@ -14,7 +15,25 @@ class SimpleChunkerService:
         self.config_service = config_service
         self.config = config_service.get_chunking_config()
 
-    def chunk_document(
+    def finalize(self) -> None:
+        """Destruct the service and close resources."""
+        return None
+
+    def get_cache_stats(self) -> SplitCacheStats:
+        """No LLM splits, so nothing is cached."""
+        return SplitCacheStats()
+
+    async def chunk_document(
+        self,
+        content: str,
+        title: str,
+        source: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[DocumentChunk]:
+        """Chunk document using simple rules."""
+        return self.split_document(content, title, source, metadata)
+
+    def split_document(
         self,
         content: str,
         title: str,
@@ -22,7 +41,7 @@ class SimpleChunkerService:
         metadata: Optional[Dict[str, Any]] = None
     ) -> List[DocumentChunk]:
         """
-        Chunk document using simple rules.
+        Chunk document using simple rules, synchronously.
         
         Args:
             content: Document content
@@ -36,6 +55,34 @@ class SimpleChunkerService:
         if not content.strip():
             return []
         
+        chunks = list(self.iter_chunks(content, title, source, metadata))
+
+        # Update total chunks in metadata
+        for chunk in chunks:
+            chunk.metadata["total_chunks"] = len(chunks)
+        
+        return chunks
+
+    def iter_chunks(
+        self,
+        content: str,
+        title: str,
+        source: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Iterator[DocumentChunk]:
+        """
+        Stream document chunks in a single pass over the document.
+        Unlike `chunk_document`, chunks carry no `total_chunks` metadata.
+        
+        Args:
+            content: Document content
+            title: Document title
+            source: Document source
+            metadata: Additional metadata
+        
+        Yields:
+            Document chunks
+        """
         base_metadata = {
             "title": title,
             "source": source,
@@ -43,57 +90,16 @@ class SimpleChunkerService:
             **(metadata or {})
         }
         
-        # Split on paragraphs first
-        paragraphs = re.split(r'\n\s*\n', content)
-        chunks = []
-        current_chunk = ""
-        current_pos = 0
-        chunk_index = 0
-        
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if not paragraph:
-                continue
-            
-            # Check if adding this paragraph exceeds chunk size
-            potential_chunk = current_chunk + "\n\n" + paragraph if current_chunk else paragraph
-            
-            if len(potential_chunk) <= self.config.chunk_size:
-                current_chunk = potential_chunk
-            else:
-                # Save current chunk if it exists
-                if current_chunk:
-                    chunks.append(self._create_chunk(
-                        current_chunk,
-                        chunk_index,
-                        current_pos,
-                        current_pos + len(current_chunk),
-                        base_metadata.copy()
-                    ))
-                    
-                    # Move position, but ensure overlap is respected
-                    overlap_start = max(0, len(current_chunk) - self.config.chunk_overlap)
-                    current_pos += overlap_start
-                    chunk_index += 1
-                
-                # Start new chunk with current paragraph
-                current_chunk = paragraph
-        
-        # Add final chunk
-        if current_chunk:
-            chunks.append(self._create_chunk(
-                current_chunk,
+        # Pack paragraphs into chunks by offset, without concatenating them
+        spans = iter_paragraph_chunk_spans(content, self.config.chunk_size, self.config.chunk_overlap)
+        for chunk_index, (start_pos, end_pos) in enumerate(spans):
+            yield self._create_chunk(
+                content[start_pos:end_pos],
                 chunk_index,
-                current_pos,
-                current_pos + len(current_chunk),
+                start_pos,
+                end_pos,
                 base_metadata.copy()
-            ))
-        
-        # Update total chunks in metadata
-        for chunk in chunks:
-            chunk.metadata["total_chunks"] = len(chunks)
-        
-        return chunks
+            )
     
     def _create_chunk(
         self,
@@ -0,0 +1,103 @@
+from typing import Iterator, Tuple
+from collections import deque
+import re
+
+# a (start, end) character span of a document
+Span = Tuple[int, int]
+
+# blank line(s) between paragraphs
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+# characters a window chunk prefers to end on
+_WINDOW_BOUNDARY_CHARS = '.!?\n'
+# how far back a window chunk looks for a boundary
+_WINDOW_BOUNDARY_LOOKBACK = 200
+
+# single-pass chunking of a document into character spans.
+# chunks are never built by concatenating strings and their offsets are
+# never recovered by searching the document: every function walks the
+# document once and yields (start, end) offsets into it, so chunking stays
+# linear in the document size.
+
+def strip_span(content: str, start: int, end: int) -> Span:
+    """Narrow a span to exclude its leading and trailing whitespace."""
+    while start < end and content[start].isspace():
+        start += 1
+    while end > start and content[end - 1].isspace():
+        end -= 1
+    return start, end
+
+def iter_paragraph_spans(content: str) -> Iterator[Span]:
+    """Yield the spans of the non-blank paragraphs of a document."""
+    pos = 0
+    for match in _PARAGRAPH_BREAK.finditer(content):
+        start, end = strip_span(content, pos, match.start())
+        if start < end:
+            yield start, end
+        pos = match.end()
+
+    start, end = strip_span(content, pos, len(content))
+    if start < end:
+        yield start, end
+
+def iter_paragraph_chunk_spans(content: str, chunk_size: int, chunk_overlap: int) -> Iterator[Span]:
+    """
+    Pack consecutive paragraphs into chunks of up to `chunk_size` characters.
+    The trailing paragraphs of a chunk that fit in `chunk_overlap` characters
+    open the next chunk. Every chunk ends on a paragraph that no previous chunk
+    included, so chunking always moves forward however close the overlap is
+    to the chunk size. A paragraph longer than `chunk_size` is its own chunk.
+    """
+    current = deque()
+    for start, end in iter_paragraph_spans(content):
+        if current and end - current[0][0] > chunk_size:
+            yield current[0][0], current[-1][1]
+
+            # Keep the trailing paragraphs within the overlap that leave room for this one
+            while current and (current[-1][1] - current[0][0] > chunk_overlap or end - current[0][0] > chunk_size):
+                current.popleft()
+
+        current.append((start, end))
+
+    if current:
+        yield current[0][0], current[-1][1]
+
+def iter_window_spans(
+    content: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    min_chunk_size: int,
+    start: int = 0,
+    end: int = -1
+) -> Iterator[Span]:
+    """
+    Slide a `chunk_size` window over `content[start:end]`, ending every chunk
+    at a sentence or line boundary when one is close to the window end.
+    Consecutive chunks overlap by up to `chunk_overlap` characters, but the
+    window always advances by at least `chunk_size - chunk_overlap` characters
+    or to the end of the previous chunk, so it can neither stall nor leave gaps,
+    and every chunk ends past the previous one, so no chunk lies inside another.
+    """
+    end = len(content) if end < 0 else end
+    min_step = max(1, chunk_size - chunk_overlap)
+    pos = last_end = start
+
+    while pos < end:
+        window_end = pos + chunk_size
+        if window_end >= end:
+            # Last chunk
+            yield pos, end
+            return
+
+        # Try to end at a sentence boundary past the end of the previous chunk
+        chunk_end = window_end
+        for i in range(window_end, max(pos + min_chunk_size, window_end - _WINDOW_BOUNDARY_LOOKBACK, last_end - 1), -1):
+            if content[i] in _WINDOW_BOUNDARY_CHARS:
+                chunk_end = i + 1
+                break
+
+        yield pos, chunk_end
+        if chunk_end >= end:
+            # A boundary at the last character ended the span
+            return
+        last_end = chunk_end
+        pos = min(chunk_end, max(chunk_end - chunk_overlap, pos + min_step))
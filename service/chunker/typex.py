@@ -1,4 +1,4 @@
-from typing import Dict, List, Protocol, Optional, Any
+from typing import Dict, List, Protocol, Optional, Any, runtime_checkable
 from dataclasses import dataclass
 
 @dataclass
@@ -17,6 +17,17 @@ class DocumentChunk:
             # Rough estimation: ~4 characters per token
             self.token_count = len(self.content) // 4
 
+@dataclass
+class SplitCacheStats:
+    """Semantic split cache statistics."""
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
 
 # chunker services must implement this protocol
 class IChunkerService(Protocol): 
@@ -30,7 +41,24 @@ class IChunkerService(Protocol):
         """Chunk TEXT."""
         pass
 
+    def get_cache_stats(self) -> SplitCacheStats:
+        """Get semantic split cache statistics."""
+        pass
+
     def finalize(self) -> None:
         """Destruct the service and close resources."""
         pass
 
+# chunker services whose chunking is pure CPU work (no LLM or I/O) also
+# implement this protocol, so that their chunking can run in worker processes
+@runtime_checkable
+class ICPUChunkerService(Protocol):
+    def split_document(
+        self,
+        content: str,
+        title: str,
+        source: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[DocumentChunk]:
+        """Chunk TEXT synchronously."""
+        pass
@@ -1,6 +1,7 @@
 import os
+from typing import Dict
 
-from .typex import ChunkingConfig
+from .typex import ChunkingConfig, CrawlHostPolicy, LightRAGConfig
 
 # compliant with IConfigService protocol
 class EnvVarsConfigService:
@@ -16,6 +17,18 @@ class EnvVarsConfigService:
         """Get Repo urls."""
         return os.environ.get("REPO_URLS", "")
 
+    def get_repo_max_concurrent(self) -> int:
+        """Get max number of repos processed concurrently."""
+        return int(os.environ.get("REPO_MAX_CONCURRENT", 4))
+
+    def get_repo_mode(self) -> str:
+        """Get repo mode: crawl (list and crawl each .md URL) or archive (download one archive per repo)."""
+        return os.environ.get("REPO_MODE", "crawl")
+
+    def get_repo_state_dir(self) -> str:
+        """Get repo state dir where the last synced commit and blob SHAs are recorded."""
+        return os.environ.get("REPO_STATE_DIR", ".cache/repo")
+
     def get_github_token(self) -> str:
         """Get Github token."""
         return os.environ.get("GITHUB_TOKEN", "")
@@ -36,9 +49,46 @@ class EnvVarsConfigService:
         """Get Gitlab base url."""
         return os.environ.get("GITLAB_BASE_URL", "")
 
+    def get_gitlab_max_concurrent_pages(self) -> int:
+        """Get max number of Gitlab tree pages fetched concurrently."""
+        return int(os.environ.get("GITLAB_MAX_CONCURRENT_PAGES", 8))
+
+    # crawl service
+    def get_crawl_cache_dir(self) -> str:
+        """Get crawl cache dir (crawl cache and resumable frontier). Empty disables both."""
+        return os.environ.get("CRAWL_CACHE_DIR", os.path.join(".cache", "crawl"))
+
+    def get_crawl_default_host_policy(self) -> CrawlHostPolicy:
+        """Get crawl politeness policy for hosts without a specific policy."""
+        return CrawlHostPolicy(
+            max_concurrent=int(os.environ.get("CRAWL_HOST_MAX_CONCURRENT", 5)),
+            requests_per_second=float(os.environ.get("CRAWL_HOST_RATE", 10.0)),
+            burst=int(os.environ.get("CRAWL_HOST_BURST", 10))
+        )
+
+    def get_crawl_host_policies(self) -> Dict[str, CrawlHostPolicy]:
+        """
+        Get crawl politeness policies by host.
+        Format: host=max_concurrent:requests_per_second[:burst],...
+        i.e. raw.githubusercontent.com=8:10,gitlab.example.com=4:2:4
+        """
+        default = self.get_crawl_default_host_policy()
+        policies = {}
+        for item in os.environ.get("CRAWL_HOST_LIMITS", "").split(","):
+            if not item.strip():
+                continue
+            host, limits = item.strip().split("=", 1)
+            parts = limits.split(":")
+            policies[host.strip().lower()] = CrawlHostPolicy(
+                max_concurrent=int(parts[0]),
+                requests_per_second=float(parts[1]) if len(parts) > 1 else default.requests_per_second,
+                burst=int(parts[2]) if len(parts) > 2 else default.burst
+            )
+        return policies
+
     # lightrag service
     def get_lightrag_work_dir(self) -> str:
-        """Get RAG work dir."""
+        """Get RAG work dir (root of the versioned index builds)."""
         return os.environ.get("LIGHTRAG_WORK_DIR", "")
 
     def get_lightrag_llm_type(self) -> str:
@@ -49,6 +99,23 @@ class EnvVarsConfigService:
         """Get llm model."""
         return os.environ.get("LIGHTRAG_LLM_MODEL", "")
 
+    def get_lightrag_keep_versions(self) -> int:
+        """Get number of previous LightRAG versions kept for rollback."""
+        return int(os.environ.get("LIGHTRAG_KEEP_VERSIONS", 3))
+
+    def get_lightrag_config(self) -> LightRAGConfig:
+        """Get LightRAG throughput configuration."""
+        return LightRAGConfig(
+            insert_batch_size=int(os.environ.get("LIGHTRAG_INSERT_BATCH_SIZE", 10)),
+            max_parallel_insert=int(os.environ.get("LIGHTRAG_MAX_PARALLEL_INSERT", 2)),
+            llm_max_async=int(os.environ.get("LIGHTRAG_LLM_MAX_ASYNC", 4)),
+            embedding_batch_num=int(os.environ.get("LIGHTRAG_EMBEDDING_BATCH_NUM", 32)),
+            embedding_max_async=int(os.environ.get("LIGHTRAG_EMBEDDING_MAX_ASYNC", 16)),
+            chunk_token_size=int(os.environ.get("LIGHTRAG_CHUNK_TOKEN_SIZE", 1200)),
+            chunk_overlap_token_size=int(os.environ.get("LIGHTRAG_CHUNK_OVERLAP_TOKEN_SIZE", 100)),
+            gemini_max_concurrent=int(os.environ.get("LIGHTRAG_GEMINI_MAX_CONCURRENT", 8))
+        )
+
     # neo4j service
     def get_neo4j_uri(self) -> str:
         """Get Neo4j URI."""
@@ -62,7 +129,27 @@ class EnvVarsConfigService:
         """Get Neo4j password."""
         return os.environ.get("NEO4J_PASSWORD", "")
 
+    def get_neo4j_batch_size(self) -> int:
+        """Get Neo4j batch size for bulk writes."""
+        return int(os.environ.get("NEO4J_BATCH_SIZE", 1000))
+
+    def get_neo4j_driver_type(self) -> str:
+        """Get Neo4j driver type: sync or async."""
+        return os.environ.get("NEO4J_DRIVER_TYPE", "sync")
+
+    def get_neo4j_max_pool_size(self) -> int:
+        """Get Neo4j max connection pool size."""
+        return int(os.environ.get("NEO4J_MAX_POOL_SIZE", 100))
+
+    def get_neo4j_acquisition_timeout(self) -> float:
+        """Get Neo4j connection acquisition timeout in seconds."""
+        return float(os.environ.get("NEO4J_ACQUISITION_TIMEOUT", 60.0))
+
     # chunking service
+    def get_chunker_type(self) -> str:
+        """Get chunker type (semantic, simple or lexical)."""
+        return os.environ.get("CHUNKER_TYPE", "semantic")
+
     def get_chunking_config(self) -> ChunkingConfig:
         """Get chunking configuration."""
         return ChunkingConfig(
@@ -71,9 +158,20 @@ class EnvVarsConfigService:
             max_chunk_size=int(os.environ.get("MAX_CHUNK_SIZE", 2000)),
             min_chunk_size=int(os.environ.get("MIN_CHUNK_SIZE", 100)),
             use_semantic_splitting=os.environ.get("USE_SEMANTIC_SPLITTING", "true").lower() == "true",
-            preserve_structure=os.environ.get("PRESERVE_STRUCTURE", "true").lower() == "true"
+            preserve_structure=os.environ.get("PRESERVE_STRUCTURE", "true").lower() == "true",
+            max_concurrent_splits=int(os.environ.get("MAX_CONCURRENT_SPLITS", 8)),
+            lexical_window_sentences=int(os.environ.get("LEXICAL_WINDOW_SENTENCES", 3)),
+            lexical_drop_stddevs=float(os.environ.get("LEXICAL_DROP_STDDEVS", 0.5))
         )
 
+    def get_chunk_cache_dir(self) -> str:
+        """Get semantic split cache dir. Empty disables it."""
+        return os.environ.get("CHUNK_CACHE_DIR", os.path.join(".cache", "chunk"))
+
+    def get_chunk_max_workers(self) -> int:
+        """Get max chunking worker processes. 0 sizes the pool to the available cores."""
+        return int(os.environ.get("CHUNK_MAX_WORKERS", 0))
+
     # llm service
     def get_llm_provider(self) -> str:
         """Get LLM provider."""
@@ -130,6 +228,10 @@ class EnvVarsConfigService:
         """Get dimensions for embedding."""
         return int(os.environ.get("EMBEDDED_DIMENSIONS", 1024))
 
+    def get_embedded_local_batch_size(self) -> int:
+        """Get batch size for local (sentence transformers) embedding."""
+        return int(os.environ.get("EMBEDDED_LOCAL_BATCH_SIZE", 64))
+
     def finalize(self) -> None:
         return None
 
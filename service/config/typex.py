@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Dict, Protocol
 from dataclasses import dataclass
 
 @dataclass
@@ -10,6 +10,12 @@ class ChunkingConfig:
     min_chunk_size: int = 100
     use_semantic_splitting: bool = True
     preserve_structure: bool = True
+    # oversized sections split by the LLM at the same time
+    max_concurrent_splits: int = 8
+    # lexical chunker: sentences per compared window and the similarity
+    # drop (in standard deviations below the mean) that marks a boundary
+    lexical_window_sentences: int = 3
+    lexical_drop_stddevs: float = 0.5
     
     def __post_init__(self):
         """Validate configuration."""
@@ -17,6 +23,51 @@ class ChunkingConfig:
             raise ValueError("Chunk overlap must be less than chunk size")
         if self.min_chunk_size <= 0:
             raise ValueError("Minimum chunk size must be positive")
+        if self.max_concurrent_splits <= 0:
+            raise ValueError("Max concurrent splits must be positive")
+        if self.lexical_window_sentences <= 0:
+            raise ValueError("Lexical window sentences must be positive")
+
+@dataclass
+class CrawlHostPolicy:
+    """Politeness policy for crawling a single host."""
+    max_concurrent: int = 5
+    requests_per_second: float = 10.0
+    burst: int = 10
+
+    def __post_init__(self):
+        """Validate configuration."""
+        if self.max_concurrent <= 0:
+            raise ValueError("Max concurrent requests must be positive")
+        if self.requests_per_second <= 0:
+            raise ValueError("Requests per second must be positive")
+        if self.burst <= 0:
+            raise ValueError("Burst must be positive")
+
+@dataclass
+class LightRAGConfig:
+    """Throughput configuration for LightRAG."""
+    insert_batch_size: int = 10
+    max_parallel_insert: int = 2
+    llm_max_async: int = 4
+    embedding_batch_num: int = 32
+    embedding_max_async: int = 16
+    chunk_token_size: int = 1200
+    chunk_overlap_token_size: int = 100
+    gemini_max_concurrent: int = 8
+
+    def __post_init__(self):
+        """Validate configuration."""
+        if self.insert_batch_size <= 0:
+            raise ValueError("Insert batch size must be positive")
+        if self.max_parallel_insert <= 0:
+            raise ValueError("Max parallel insert must be positive")
+        if self.llm_max_async <= 0 or self.embedding_max_async <= 0 or self.gemini_max_concurrent <= 0:
+            raise ValueError("Max async calls must be positive")
+        if self.embedding_batch_num <= 0:
+            raise ValueError("Embedding batch size must be positive")
+        if self.chunk_overlap_token_size >= self.chunk_token_size:
+            raise ValueError("Chunk overlap token size must be less than chunk token size")
 
 # config services must implement this protocol
 class IConfigService(Protocol): 
@@ -29,6 +80,18 @@ class IConfigService(Protocol):
         """Get Repo urls."""
         pass
 
+    def get_repo_max_concurrent(self) -> int:
+        """Get max number of repos processed concurrently."""
+        pass
+
+    def get_repo_mode(self) -> str:
+        """Get repo mode: crawl (list and crawl each .md URL) or archive (download one archive per repo)."""
+        pass
+
+    def get_repo_state_dir(self) -> str:
+        """Get repo state dir where the last synced commit and blob SHAs are recorded."""
+        pass
+
     def get_github_token(self) -> str:
         """Get Github token."""
         pass
@@ -49,9 +112,26 @@ class IConfigService(Protocol):
         """Get Gitlab base url."""
         pass
 
+    def get_gitlab_max_concurrent_pages(self) -> int:
+        """Get max number of Gitlab tree pages fetched concurrently."""
+        pass
+
+    # crawl service
+    def get_crawl_cache_dir(self) -> str:
+        """Get crawl cache dir (crawl cache and resumable frontier). Empty disables both."""
+        pass
+
+    def get_crawl_default_host_policy(self) -> CrawlHostPolicy:
+        """Get crawl politeness policy for hosts without a specific policy."""
+        pass
+
+    def get_crawl_host_policies(self) -> Dict[str, CrawlHostPolicy]:
+        """Get crawl politeness policies by host."""
+        pass
+
     # lightrag service
     def get_lightrag_work_dir(self) -> str:
-        """Get RAG work dir."""
+        """Get RAG work dir (root of the versioned index builds)."""
         pass
 
     def get_lightrag_llm_type(self) -> str:
@@ -62,11 +142,31 @@ class IConfigService(Protocol):
         """Get LLM model."""
         pass
 
+    def get_lightrag_config(self) -> LightRAGConfig:
+        """Get LightRAG throughput configuration."""
+        pass
+
+    def get_lightrag_keep_versions(self) -> int:
+        """Get number of previous LightRAG versions kept for rollback."""
+        pass
+
     # chunking service
+    def get_chunker_type(self) -> str:
+        """Get chunker type (semantic, simple or lexical)."""
+        pass
+
     def get_chunking_config(self) -> ChunkingConfig:
         """Get chunking configuration."""
         pass
 
+    def get_chunk_cache_dir(self) -> str:
+        """Get semantic split cache dir. Empty disables it."""
+        pass
+
+    def get_chunk_max_workers(self) -> int:
+        """Get max chunking worker processes. 0 sizes the pool to the available cores."""
+        pass
+
     # neo4j service
     def get_neo4j_uri(self) -> str:
         """Get Neo4j URI."""
@@ -80,6 +180,22 @@ class IConfigService(Protocol):
         """Get Neo4j password."""
         pass
 
+    def get_neo4j_batch_size(self) -> int:
+        """Get Neo4j batch size for bulk writes."""
+        pass
+
+    def get_neo4j_driver_type(self) -> str:
+        """Get Neo4j driver type: sync or async."""
+        pass
+
+    def get_neo4j_max_pool_size(self) -> int:
+        """Get Neo4j max connection pool size."""
+        pass
+
+    def get_neo4j_acquisition_timeout(self) -> float:
+        """Get Neo4j connection acquisition timeout in seconds."""
+        pass
+
     # llm service
     def get_llm_provider(self) -> str:
         """Get LLM provider."""
@@ -130,6 +246,10 @@ class IConfigService(Protocol):
         """Get dimensions for embedding."""
         pass
 
+    def get_embedded_local_batch_size(self) -> int:
+        """Get batch size for local (sentence transformers) embedding."""
+        pass
+
     def finalize(self) -> None:
         """Destruct the service and close resources."""
         pass
@@ -0,0 +1,101 @@
+from urllib.parse import urldefrag, urlparse, urlunparse
+from typing import Optional
+from dataclasses import dataclass
+import os
+import time
+import sqlite3
+import hashlib
+
+from .typex import CrawlCacheStats
+
+@dataclass
+class CrawlCacheEntry:
+    """Represents a cached page and its validators."""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+    markdown: str
+
+def normalize_cache_url(url: str) -> str:
+    """Normalize a URL so that equivalent URLs share a cache key."""
+    url = urldefrag(url)[0]
+    parsed = urlparse(url)
+    return urlunparse(parsed._replace(scheme=parsed.scheme.lower(), netloc=parsed.netloc.lower()))
+
+def hash_content(content: str) -> str:
+    """Hash page content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+# on-disk crawl cache backed by a single SQLite file.
+# pages are keyed by normalized URL and stored with their ETag/Last-Modified
+# validators so that re-crawls can send conditional requests and serve 304s
+# from disk.
+class CrawlCache:
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, "crawl_cache.db"))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT NOT NULL,
+                markdown TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+        self.stats = CrawlCacheStats()
+
+    def get(self, url: str) -> Optional[CrawlCacheEntry]:
+        """Get the cached entry of a URL."""
+        key = normalize_cache_url(url)
+        row = self.conn.execute(
+            "SELECT etag, last_modified, content_hash, markdown FROM pages WHERE url = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        etag, last_modified, content_hash, markdown = row
+        return CrawlCacheEntry(
+            url=key,
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=content_hash,
+            markdown=markdown
+        )
+
+    def put(self, url: str, markdown: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store a freshly fetched page."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages (url, etag, last_modified, content_hash, markdown, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (normalize_cache_url(url), etag, last_modified, hash_content(markdown), markdown, time.time())
+        )
+        self.conn.commit()
+
+    def conditional_headers(self, entry: Optional[CrawlCacheEntry]) -> dict[str, str]:
+        """Get the conditional request headers for a cached entry."""
+        headers = {}
+        if entry is None:
+            return headers
+
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        return headers
+
+    def record_hit(self, entry: CrawlCacheEntry) -> None:
+        """Record a page served from disk."""
+        self.stats.hits += 1
+        self.stats.bytes_saved += len(entry.markdown.encode("utf-8"))
+
+    def record_miss(self) -> None:
+        """Record a page downloaded from the network."""
+        self.stats.misses += 1
+
+    def close(self) -> None:
+        self.conn.close()
@@ -1,18 +1,50 @@
-from urllib.parse import urldefrag
-from typing import Dict, List, Any
+from urllib.parse import urldefrag, urlparse
+from typing import Dict, List, Any, Optional, AsyncIterator
+from itertools import islice
 import re
+import os
+import asyncio
 import logging
 
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode, MemoryAdaptiveDispatcher
+import httpx
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode, MemoryAdaptiveDispatcher, RateLimiter
 
 from service.config.typex import IConfigService
+from .typex import CrawlCacheStats, CrawlHostStats
+from .cache import CrawlCache
+from .frontier import CrawlFrontier, FRONTIER_DB_NAME, get_crawl_job_id
+from .scheduler import HostScheduler, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+# status codes hosts use to ask us to slow down
+_RATE_LIMIT_CODES = (429, 503)
+# max retries of a rate-limited raw fetch
+_MAX_RATE_LIMIT_RETRIES = 3
+# delay before retrying a rate-limited fetch without Retry-After
+_DEFAULT_RETRY_AFTER = 5.0
+
+# matches GitHub web URLs of files i.e. https://github.com/owner/repo/blob/main/README.md
+_GITHUB_BLOB_RE = re.compile(r'^https?://github\.com/([^/]+)/([^/]+)/blob/(.+)$')
+
 # compliant with ICrawlService protocol
 class AICrawlService:
     def __init__(self, config_service: IConfigService):
         self.config_service = config_service
+        # long-lived browser and HTTP client shared by all crawls
+        # they are lazily started and closed in finalize()
+        self.crawler: Optional[AsyncWebCrawler] = None
+        self.http_client: Optional[httpx.AsyncClient] = None
+        # guards the lazy start of the shared browser
+        self.crawler_lock = asyncio.Lock()
+        # conditional-GET cache for raw markdown files (disabled if no dir)
+        cache_dir = self.config_service.get_crawl_cache_dir()
+        self.cache: Optional[CrawlCache] = CrawlCache(cache_dir) if cache_dir else None
+        # per-host concurrency caps and request rates for raw fetches
+        self.scheduler = HostScheduler(
+            self.config_service.get_crawl_default_host_policy(),
+            self.config_service.get_crawl_host_policies()
+        )
 
     def _is_gitlab_url(self, url: str) -> bool:
         """Check if the URL is a GitLab URL."""
@@ -97,82 +129,331 @@ class AICrawlService:
             
         return headers
 
+    def _get_raw_url(self, url: str) -> Optional[str]:
+        """
+        Get the plain-text URL of a markdown file hosted on GitHub or GitLab.
+        Returns None if the URL is not a markdown file that can be fetched raw.
+        """
+        parsed = urlparse(url)
+        if not parsed.path.lower().endswith('.md'):
+            return None
+
+        if parsed.netloc == 'raw.githubusercontent.com':
+            return url
+
+        # Convert URLs like:
+        # https://github.com/user/repo/blob/main/README.md
+        # to raw format:
+        # https://raw.githubusercontent.com/user/repo/main/README.md
+        match = _GITHUB_BLOB_RE.match(url)
+        if match:
+            owner, repo, ref_and_path = match.groups()
+            return f"https://raw.githubusercontent.com/{owner}/{repo}/{ref_and_path}"
+
+        # GitLab blob URLs are served raw by the repository files API
+        api_url = self._convert_to_api_url(url)
+        if '/api/v4/projects/' in api_url and '/raw' in api_url:
+            return api_url
+
+        return None
+
+    def _get_raw_headers(self, raw_url: str) -> Dict[str, str]:
+        """Get authentication headers for the given raw URL."""
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        }
+
+        if urlparse(raw_url).netloc == 'raw.githubusercontent.com':
+            github_token = self.config_service.get_github_token()
+            if github_token:
+                headers['Authorization'] = f'token {github_token}'
+        elif '/api/v4/' in raw_url:
+            gitlab_token = self.config_service.get_gitlab_token()
+            if gitlab_token:
+                headers['PRIVATE-TOKEN'] = gitlab_token
+
+        return headers
+
+    async def _fetch_raw(self, http_client: httpx.AsyncClient, url: str, raw_url: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a raw markdown file. Returns None if it could not be fetched.
+        Cached files are revalidated with a conditional request and served 
+        from disk on 304.
+        """
+        entry = self.cache.get(url) if self.cache else None
+        headers = self._get_raw_headers(raw_url)
+        if self.cache:
+            headers.update(self.cache.conditional_headers(entry))
+
+        host = urlparse(raw_url).netloc
+        for attempt in range(_MAX_RATE_LIMIT_RETRIES + 1):
+            try:
+                async with self.scheduler.slot(host):
+                    response = await http_client.get(raw_url, headers=headers)
+            except httpx.HTTPError as e:
+                logger.warning(f"Raw fetch failed for {raw_url}: {e}")
+                return None
+
+            # GitHub signals secondary rate limits with 403 + Retry-After
+            retry_after = parse_retry_after(response.headers.get('retry-after'))
+            rate_limited = response.status_code in _RATE_LIMIT_CODES or (response.status_code == 403 and retry_after is not None)
+            if not rate_limited or attempt == _MAX_RATE_LIMIT_RETRIES:
+                break
+
+            delay = retry_after if retry_after is not None else _DEFAULT_RETRY_AFTER * (2 ** attempt)
+            logger.warning(f"Rate limited by {host}, retrying {raw_url} in {delay:.1f}s")
+            self.scheduler.defer(host, delay)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.record_hit(entry)
+            return {'url': url, 'markdown': entry.markdown}
+
+        if response.status_code != 200:
+            logger.warning(f"Raw fetch failed for {raw_url}: HTTP {response.status_code}")
+            return None
+
+        markdown = response.text
+        if self.cache:
+            self.cache.record_miss()
+            self.cache.put(
+                url,
+                markdown,
+                etag=response.headers.get('etag'),
+                last_modified=response.headers.get('last-modified')
+            )
+
+        return {'url': url, 'markdown': markdown}
+
+    async def _get_crawler(self) -> AsyncWebCrawler:
+        """Get the shared browser crawler, starting it on first use."""
+        async with self.crawler_lock:
+            if self.crawler is None:
+                browser_config = BrowserConfig(
+                    headless=True,
+                    verbose=False
+                )
+                crawler = AsyncWebCrawler(config=browser_config)
+                # Every page sets the auth headers of its own URL, so that
+                # concurrent crawls can share the browser without swapping headers
+                crawler.crawler_strategy.set_hook("before_goto", self._set_page_headers)
+                await crawler.start()
+                self.crawler = crawler
+
+        return self.crawler
+
+    async def _set_page_headers(self, page, context=None, url: str = "", **kwargs):
+        """Set the auth headers of a page right before it navigates to its URL."""
+        await page.set_extra_http_headers(self._get_auth_headers(url))
+        return page
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0),
+                follow_redirects=True
+            )
+
+        return self.http_client
+
     async def crawl(self, start_urls, max_depth, max_concurrent) -> List[Dict[str,Any]]:
         """Returns list of dicts with url and markdown."""
+        return [doc async for doc in self.crawl_stream(start_urls, max_depth, max_concurrent)]
+
+    def has_pending_job(self, start_urls, max_depth, job_id: Optional[str] = None) -> bool:
+        """
+        Check whether a crawl of these URLs was interrupted and will be resumed.
+        A job interrupted before it completed any URL has nothing to resume.
+        """
+        start_urls = [urldefrag(u)[0] for u in start_urls]
+        frontier = self._open_frontier(job_id or get_crawl_job_id(start_urls, max_depth))
+        try:
+            return frontier.is_running() and frontier.count_completed() > 0
+        finally:
+            frontier.close()
+
+    def _open_frontier(self, job_id: str) -> CrawlFrontier:
+        """Open the crawl frontier of a job (persisted alongside the crawl cache)."""
+        cache_dir = self.config_service.get_crawl_cache_dir()
+        db_path = os.path.join(cache_dir, FRONTIER_DB_NAME) if cache_dir else ":memory:"
+        return CrawlFrontier(db_path, job_id)
+
+    async def crawl_stream(
+        self,
+        start_urls,
+        max_depth,
+        max_concurrent,
+        job_id: Optional[str] = None,
+        defer_completion: bool = False
+    ) -> AsyncIterator[Dict[str,Any]]:
+        """
+        Yields dicts with url and markdown as pages complete.
+        The frontier is persisted per crawl job (derived from the start URLs
+        and depth if no job id is given): an interrupted crawl of the same 
+        job resumes where it stopped. A URL is only marked completed once
+        the consumer has processed its page i.e. asked for the next one.
+        With `defer_completion`, consumers that commit pages later (i.e. in
+        batches) get a `complete` callable with every page and call it once
+        the page is committed; pages never completed are crawled again when
+        the job resumes.
+        `start_urls` can also be an async iterator of URL batches (i.e. one
+        per discovered repo) with an explicit job id: every batch is crawled
+        as soon as it arrives.
+        """
         dispatcher = MemoryAdaptiveDispatcher(
             memory_threshold_percent=70.0,
             check_interval=1.0,
-            max_session_permit=max_concurrent
+            max_session_permit=max_concurrent,
+            # backs off per domain when pages answer with rate limit codes
+            rate_limiter=RateLimiter(
+                base_delay=(1.0, 3.0),
+                max_delay=60.0,
+                max_retries=_MAX_RATE_LIMIT_RETRIES,
+                rate_limit_codes=list(_RATE_LIMIT_CODES)
+            )
         )
 
-        visited = set()
-
         def normalize_url(url):
             return urldefrag(url)[0]
 
-        current_urls = set([normalize_url(u) for u in start_urls])
-        results_all = []
+        start_batches = None
+        if hasattr(start_urls, "__aiter__"):
+            if job_id is None:
+                raise ValueError("A job id is required to crawl start URLs streamed in batches")
+            start_batches, start_urls = start_urls, []
 
-        # Group URLs by their required headers
-        for depth in range(max_depth):
-            urls_to_crawl = [normalize_url(url) for url in current_urls if normalize_url(url) not in visited]
-            if not urls_to_crawl:
-                break
+        start_urls = [normalize_url(u) for u in start_urls]
+        frontier = self._open_frontier(job_id or get_crawl_job_id(start_urls, max_depth))
+        if frontier.start(start_urls):
+            logger.info(f"Resuming crawl job {frontier.job_id}: {frontier.count_completed()} URLs already completed")
+
+        # Markdown files served as plain text by GitHub/GitLab are fetched
+        # over a pooled keep-alive HTTP client instead of a headless browser
+        # Concurrency and request rate are bounded per host by the scheduler
+        http_client = self._get_http_client()
+
+        async def fetch_raw(url: str, raw_url: str) -> tuple[str, Optional[Dict[str, Any]]]:
+            return url, await self._fetch_raw(http_client, url, raw_url)
+
+        def deliver(url: str, doc: Dict[str, Any]) -> Dict[str, Any]:
+            if not defer_completion:
+                return doc
+            frontier.deliver(url)
+            return {**doc, 'complete': lambda: frontier.complete(url)}
+
+        def add_links(result, depth: int) -> None:
+            if depth + 1 >= max_depth:
+                return
+            for link in result.links.get("internal", []):
+                frontier.add(normalize_url(link["href"]), depth + 1)
+
+        try:
+            while True:
+                if start_batches is not None:
+                    # Crawl the next batch of start URLs, then the deeper depths once all arrived
+                    batch = await anext(start_batches, None)
+                    if batch is None:
+                        start_batches = None
+                        continue
+                    for url in batch:
+                        frontier.add(normalize_url(url), 0)
+                    depth = 0
+                else:
+                    depth = frontier.next_depth()
+                    if depth is None or depth >= max_depth:
+                        break
+
+                urls_to_crawl = frontier.pending(depth)
+
+                # Fast path: raw markdown files (they carry no HTML links to follow)
+                raw_urls = {url: self._get_raw_url(url) for url in urls_to_crawl}
+                browser_urls = [url for url, raw_url in raw_urls.items() if not raw_url]
+                raw_items = [(url, raw_url) for url, raw_url in raw_urls.items() if raw_url]
+
+                # At most `max_concurrent` fetches are in flight: the next fetch starts
+                # once the consumer took a body, so memory is bounded by the window and
+                # not by the corpus size
+                pending_items = iter(raw_items)
+                raw_tasks = set()
+                try:
+                    fetched = 0
+                    while True:
+                        for url, raw_url in islice(pending_items, max(1, max_concurrent) - len(raw_tasks)):
+                            raw_tasks.add(asyncio.create_task(fetch_raw(url, raw_url)))
+                        if not raw_tasks:
+                            break
+
+                        done, raw_tasks = await asyncio.wait(raw_tasks, return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            url, result = task.result()
+                            if result is None:
+                                # Fall back to the browser
+                                browser_urls.append(url)
+                                continue
+
+                            fetched += 1
+                            # Empty files are yielded too, so consumers can tell them from failed fetches
+                            yield deliver(url, result)
+                            if not defer_completion:
+                                frontier.complete(url)
+                finally:
+                    # Stop pending fetches if the consumer stopped early
+                    for task in raw_tasks:
+                        task.cancel()
+
+                if raw_items:
+                    logger.info(f"Fetched {fetched}/{len(raw_items)} raw markdown URLs without a browser")
 
-            # Group URLs by their auth requirements
-            auth_groups = {}
-            for url in urls_to_crawl:
                 # Convert GitLab URLs to API format if possible
-                processed_url = self._convert_to_api_url(url)
-                url_headers = self._get_auth_headers(processed_url)
-                headers_key = str(sorted(url_headers.items())) if url_headers else "no_auth"
-                if headers_key not in auth_groups:
-                    auth_groups[headers_key] = {'urls': [], 'headers': url_headers}
-                auth_groups[headers_key]['urls'].append(processed_url)
-
-            next_level_urls = set()
-            
-            # Process each group with appropriate headers
-            for group_data in auth_groups.values():
-                group_urls = group_data['urls']
-                group_headers = group_data['headers']
-                
-                # Create browser config with appropriate headers
-                browser_config = BrowserConfig(
-                    headless=True, 
-                    verbose=False,
-                    headers=group_headers if group_headers else None
-                )
-                
-                # Create crawler run config
+                processed_urls = {self._convert_to_api_url(url): url for url in browser_urls}
                 run_config = CrawlerRunConfig(
                     cache_mode=CacheMode.BYPASS, 
-                    stream=False
+                    stream=True
                 )
 
-                async with AsyncWebCrawler(config=browser_config) as crawler:
-                    if len(group_urls) == 1:
-                        # Single URL
-                        result = await crawler.arun(url=group_urls[0], config=run_config)
-                        results = [result]
-                    else:
-                        # Multiple URLs with same headers
-                        results = await crawler.arun_many(urls=group_urls, config=run_config, dispatcher=dispatcher)
+                # Pages set their own auth headers (see _set_page_headers), so
+                # results are yielded as they stream off the shared browser
+                if processed_urls:
+                    crawler = await self._get_crawler()
+                    async for result in await crawler.arun_many(urls=list(processed_urls), config=run_config, dispatcher=dispatcher):
+                        url = processed_urls.get(result.url, normalize_url(result.url))
 
-                    for result in results:
-                        norm_url = normalize_url(result.url)
-                        visited.add(norm_url)
+                        if not result.success:
+                            frontier.complete(url)
+                            continue
 
-                        if result.success and result.markdown:
-                            results_all.append({'url': result.url, 'markdown': result.markdown})
-                            for link in result.links.get("internal", []):
-                                next_url = normalize_url(link["href"])
-                                if next_url not in visited:
-                                    next_level_urls.add(next_url)
+                        add_links(result, depth)
+                        # Yield the requested URL (not the API or redirect target) so that
+                        # consumers match the doc with the URL they asked for
+                        yield deliver(url, {'url': url, 'markdown': result.markdown or ""})
+                        if not defer_completion:
+                            frontier.complete(url)
 
-            current_urls = next_level_urls
+                # Anything left at this depth was attempted i.e. redirected URLs
+                frontier.complete_depth(depth)
 
-        return results_all
+            frontier.finish()
+        finally:
+            frontier.close()
 
-    def finalize(self) -> None:
-        return None
+    def get_cache_stats(self) -> CrawlCacheStats:
+        """Get crawl cache statistics."""
+        return self.cache.stats if self.cache else CrawlCacheStats()
+
+    def get_host_stats(self) -> Dict[str, CrawlHostStats]:
+        """Get crawl request statistics by host."""
+        return self.scheduler.get_stats()
+
+    async def finalize(self) -> None:
+        """Destruct the service and close resources."""
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+        if self.crawler is not None:
+            await self.crawler.close()
+            self.crawler = None
+
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
@@ -0,0 +1,202 @@
+from typing import List, Optional
+import os
+import time
+import sqlite3
+import hashlib
+
+# name of the frontier database inside the crawl cache dir
+FRONTIER_DB_NAME = "frontier.db"
+
+def get_crawl_job_id(start_urls: List[str], max_depth: int) -> str:
+    """Derive a stable crawl job id from the start URLs and depth."""
+    key = "\n".join(sorted(set(start_urls))) + f"\n{max_depth}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+# crawl frontier backed by SQLite.
+# pending URLs (by depth) and completed URLs are persisted per crawl job,
+# so that a crawl that dies halfway resumes where it stopped instead of
+# starting over. URLs handed to a consumer that completes them later are
+# delivered: they are no longer crawled, but go back to pending on resume
+# until the consumer completes them. A job that finishes with delivered
+# URLs is finishing: it is done once the consumer completed them all,
+# and resumes like a running job if the consumer dies first. Use ":memory:"
+# as the db path for a non-persistent frontier.
+class CrawlFrontier:
+    def __init__(self, db_path: str, job_id: str):
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        self.db_path = db_path
+        self.job_id = job_id
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pending (
+                job_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (job_id, url)
+            );
+            CREATE TABLE IF NOT EXISTS delivered (
+                job_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                PRIMARY KEY (job_id, url)
+            );
+            CREATE TABLE IF NOT EXISTS completed (
+                job_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                PRIMARY KEY (job_id, url)
+            );
+        """)
+        self.conn.commit()
+
+    def is_running(self) -> bool:
+        """Check whether the job was started but never finished."""
+        row = self.conn.execute("SELECT status FROM jobs WHERE job_id = ?", (self.job_id,)).fetchone()
+        return row is not None and row[0] in ("running", "finishing")
+
+    def start(self, start_urls: List[str]) -> bool:
+        """
+        Start the job, resuming it if it was interrupted.
+        Returns True if the job was resumed.
+        """
+        if self.is_running():
+            # Delivered URLs that were never completed are crawled again
+            self.conn.execute(
+                "INSERT OR IGNORE INTO pending (job_id, url, depth) SELECT job_id, url, depth FROM delivered WHERE job_id = ?",
+                (self.job_id,)
+            )
+            self.conn.execute("DELETE FROM delivered WHERE job_id = ?", (self.job_id,))
+            self.conn.execute(
+                "UPDATE jobs SET status = 'running', updated_at = ? WHERE job_id = ?",
+                (time.time(), self.job_id)
+            )
+            self.conn.commit()
+            return True
+
+        # finished or unknown job: start over
+        self.conn.execute("DELETE FROM pending WHERE job_id = ?", (self.job_id,))
+        self.conn.execute("DELETE FROM delivered WHERE job_id = ?", (self.job_id,))
+        self.conn.execute("DELETE FROM completed WHERE job_id = ?", (self.job_id,))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO jobs (job_id, status, updated_at) VALUES (?, 'running', ?)",
+            (self.job_id, time.time())
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO pending (job_id, url, depth) VALUES (?, ?, 0)",
+            [(self.job_id, url) for url in start_urls]
+        )
+        self.conn.commit()
+        return False
+
+    def next_depth(self) -> Optional[int]:
+        """Get the lowest depth with pending URLs."""
+        row = self.conn.execute("SELECT MIN(depth) FROM pending WHERE job_id = ?", (self.job_id,)).fetchone()
+        return row[0]
+
+    def pending(self, depth: int) -> List[str]:
+        """Get the pending URLs at a depth."""
+        rows = self.conn.execute(
+            "SELECT url FROM pending WHERE job_id = ? AND depth = ?",
+            (self.job_id, depth)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def is_completed(self, url: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM completed WHERE job_id = ? AND url = ?",
+            (self.job_id, url)
+        ).fetchone()
+        return row is not None
+
+    def is_delivered(self, url: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM delivered WHERE job_id = ? AND url = ?",
+            (self.job_id, url)
+        ).fetchone()
+        return row is not None
+
+    def count_completed(self) -> int:
+        row = self.conn.execute("SELECT COUNT(*) FROM completed WHERE job_id = ?", (self.job_id,)).fetchone()
+        return row[0]
+
+    def add(self, url: str, depth: int) -> None:
+        """Add a discovered URL unless it is already pending, delivered or completed."""
+        if self.is_completed(url) or self.is_delivered(url):
+            return
+
+        self.conn.execute(
+            "INSERT OR IGNORE INTO pending (job_id, url, depth) VALUES (?, ?, ?)",
+            (self.job_id, url, depth)
+        )
+        self.conn.commit()
+
+    def deliver(self, url: str) -> None:
+        """Move a URL from pending to delivered i.e. once it was handed to a consumer that completes it later."""
+        self.conn.execute(
+            "INSERT OR IGNORE INTO delivered (job_id, url, depth) SELECT job_id, url, depth FROM pending WHERE job_id = ? AND url = ?",
+            (self.job_id, url)
+        )
+        self.conn.execute("DELETE FROM pending WHERE job_id = ? AND url = ?", (self.job_id, url))
+        self.conn.commit()
+
+    def complete(self, url: str) -> None:
+        """
+        Move a URL from pending or delivered to completed. Delivered URLs can be
+        completed once the frontier is closed i.e. after the crawl ended: the
+        last one marks the finishing job as done.
+        """
+        conn = self.conn
+        if conn is None:
+            if self.db_path == ":memory:":
+                return
+            conn = sqlite3.connect(self.db_path)
+
+        try:
+            conn.execute("DELETE FROM pending WHERE job_id = ? AND url = ?", (self.job_id, url))
+            conn.execute("DELETE FROM delivered WHERE job_id = ? AND url = ?", (self.job_id, url))
+            conn.execute("INSERT OR IGNORE INTO completed (job_id, url) VALUES (?, ?)", (self.job_id, url))
+            conn.execute(
+                """UPDATE jobs SET status = 'done', updated_at = ?
+                   WHERE job_id = ? AND status = 'finishing'
+                   AND NOT EXISTS (SELECT 1 FROM delivered WHERE job_id = ?)""",
+                (time.time(), self.job_id, self.job_id)
+            )
+            conn.commit()
+        finally:
+            if conn is not self.conn:
+                conn.close()
+
+    def complete_depth(self, depth: int) -> None:
+        """Mark every URL still pending at a depth as completed i.e. once the depth was crawled."""
+        self.conn.execute(
+            "INSERT OR IGNORE INTO completed (job_id, url) SELECT job_id, url FROM pending WHERE job_id = ? AND depth = ?",
+            (self.job_id, depth)
+        )
+        self.conn.execute("DELETE FROM pending WHERE job_id = ? AND depth = ?", (self.job_id, depth))
+        self.conn.commit()
+
+    def finish(self) -> None:
+        """
+        Mark the job as done, or as finishing while delivered URLs wait to be
+        completed. The next crawl of a done job starts over.
+        """
+        self.conn.execute("DELETE FROM pending WHERE job_id = ?", (self.job_id,))
+        self.conn.execute(
+            """UPDATE jobs SET updated_at = ?, status = CASE
+                   WHEN EXISTS (SELECT 1 FROM delivered WHERE job_id = ?) THEN 'finishing'
+                   ELSE 'done' END
+               WHERE job_id = ?""",
+            (time.time(), self.job_id, self.job_id)
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
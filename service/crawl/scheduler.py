@@ -0,0 +1,104 @@
+from typing import Dict, Optional, AsyncIterator
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import time
+import asyncio
+
+from service.config.typex import CrawlHostPolicy
+from .typex import CrawlHostStats
+
+# parse a Retry-After header value (delay seconds or HTTP date) into seconds
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+# per-host state: concurrency cap, token bucket and Retry-After deferral
+class _HostState:
+    def __init__(self, policy: CrawlHostPolicy):
+        self.policy = policy
+        self.semaphore = asyncio.Semaphore(policy.max_concurrent)
+        self.tokens = float(policy.burst)
+        self.refilled_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.stats = CrawlHostStats()
+
+    async def acquire_token(self) -> None:
+        while True:
+            now = time.monotonic()
+
+            # honor Retry-After from the host
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+
+            # refill the bucket
+            elapsed = now - self.refilled_at
+            self.tokens = min(float(self.policy.burst), self.tokens + elapsed * self.policy.requests_per_second)
+            self.refilled_at = now
+
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return
+
+            await asyncio.sleep((1.0 - self.tokens) / self.policy.requests_per_second)
+
+# schedules requests per host so that each host gets its own concurrency
+# cap and request rate instead of sharing a single crawl-wide budget
+class HostScheduler:
+    def __init__(self, default_policy: CrawlHostPolicy, policies: Optional[Dict[str, CrawlHostPolicy]] = None):
+        self.default_policy = default_policy
+        self.policies = policies or {}
+        self.hosts: Dict[str, _HostState] = {}
+
+    def _get_host(self, host: str) -> _HostState:
+        host = host.lower()
+        if host not in self.hosts:
+            self.hosts[host] = _HostState(self.policies.get(host, self.default_policy))
+        return self.hosts[host]
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        """Wait for a request slot on the host and measure the request latency."""
+        state = self._get_host(host)
+        state.stats.queued += 1
+        try:
+            await state.semaphore.acquire()
+        finally:
+            state.stats.queued -= 1
+
+        try:
+            await state.acquire_token()
+            state.stats.in_flight += 1
+            start_time = time.perf_counter()
+            try:
+                yield
+            finally:
+                state.stats.in_flight -= 1
+                state.stats.completed += 1
+                state.stats.total_latency_ms += (time.perf_counter() - start_time) * 1000
+        finally:
+            state.semaphore.release()
+
+    def defer(self, host: str, seconds: float) -> None:
+        """Pause all requests to the host i.e. when it answers with Retry-After."""
+        state = self._get_host(host)
+        state.stats.throttled += 1
+        state.blocked_until = max(state.blocked_until, time.monotonic() + seconds)
+
+    def get_stats(self) -> Dict[str, CrawlHostStats]:
+        """Get request statistics by host."""
+        return {host: state.stats for host, state in self.hosts.items()}
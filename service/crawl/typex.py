@@ -1,4 +1,25 @@
-from typing import Dict, List, Protocol, Any
+from typing import Dict, List, Protocol, Any, AsyncIterator, Optional
+from dataclasses import dataclass
+
+@dataclass
+class CrawlCacheStats:
+    """Crawl cache statistics."""
+    hits: int = 0
+    misses: int = 0
+    bytes_saved: int = 0
+
+@dataclass
+class CrawlHostStats:
+    """Crawl request statistics of a single host."""
+    queued: int = 0
+    in_flight: int = 0
+    completed: int = 0
+    throttled: int = 0
+    total_latency_ms: float = 0.0
+
+    @property
+    def avg_latency_ms(self) -> float:
+        return self.total_latency_ms / self.completed if self.completed else 0.0
 
 # crawl services must implement this protocol
 class ICrawlService(Protocol): 
@@ -6,7 +27,28 @@ class ICrawlService(Protocol):
         """Crawl URLs."""
         pass
 
-    def finalize(self) -> None:
+    def crawl_stream(self, urls, max_depth, max_concurrent, job_id: Optional[str] = None, defer_completion: bool = False) -> AsyncIterator[Dict[str,Any]]:
+        """
+        Crawl URLs yielding results as pages complete. Interrupted jobs resume.
+        With `defer_completion`, every result carries a `complete` callable the
+        consumer calls once the page is committed. `urls` can also be an async
+        iterator of URL batches crawled as they arrive, given a job id.
+        """
+        pass
+
+    def has_pending_job(self, urls, max_depth, job_id: Optional[str] = None) -> bool:
+        """Check whether a crawl of these URLs was interrupted and will be resumed."""
+        pass
+
+    def get_cache_stats(self) -> CrawlCacheStats:
+        """Get crawl cache statistics."""
+        pass
+
+    def get_host_stats(self) -> Dict[str, CrawlHostStats]:
+        """Get crawl request statistics by host."""
+        pass
+
+    async def finalize(self) -> None:
         """Destruct the service and close resources."""
         pass
 
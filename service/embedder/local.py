@@ -0,0 +1,36 @@
+from typing import Dict, List
+import asyncio
+import threading
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+# process-wide registry of local embedding models:
+# every model is loaded once and shared by all callers
+_models: Dict[str, SentenceTransformer] = {}
+_models_lock = threading.Lock()
+
+def get_sentence_transformer(model_name: str) -> SentenceTransformer:
+    """Get a local embedding model, loading it on first use."""
+    model = _models.get(model_name)
+    if model is not None:
+        return model
+
+    with _models_lock:
+        # another thread may have loaded it while we waited for the lock
+        if model_name not in _models:
+            print(f"Loading local embedding model {model_name}...")
+            _models[model_name] = SentenceTransformer(model_name)
+        return _models[model_name]
+
+async def encode_texts(model_name: str, texts: List[str], batch_size: int) -> np.ndarray:
+    """
+    Embed texts with a local embedding model.
+    Loading and encoding run in a worker thread so that the event loop
+    keeps serving concurrent queries while the model is busy.
+    """
+    def _encode() -> np.ndarray:
+        model = get_sentence_transformer(model_name)
+        return model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+
+    return await asyncio.to_thread(_encode)
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime, timezone
 from pydantic import BaseModel
 
@@ -101,6 +101,31 @@ class GraphitiGraphService:
         """
         return []
 
+    async def iter_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Not implemented in this service.
+        Stream records from the knowledge graph.
+        """
+        return
+        yield
+
+    async def query_batch(
+        self,
+        query: str,
+        rows: List[Dict[str, Any]],
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Not implemented in this service.
+        Write rows to the knowledge graph in batches.
+        """
+        return 0
+
     async def search(
         self,
         query: str,
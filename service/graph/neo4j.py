@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -6,6 +6,9 @@ from neo4j import GraphDatabase
 
 from service.config.typex import IConfigService
 
+# max number of records buffered between the driver thread and the consumer
+_STREAM_QUEUE_SIZE = 1000
+
 # compliant with IGraphService protocol
 # please note that Neo4j Python driver is synchronous
 # so we use asyncio to run it in a thread executor
@@ -80,13 +83,95 @@ class Neo4jGraphService:
 
         # return result.records, result.keys  
 
-        records = []
-        for record in result.records:
-            # Convert Neo4j Record to a dictionary
-            record_dict = {key: record.data()[key] for key in record.data()}
-            records.append(record_dict)
+        # Convert Neo4j Records to dictionaries
+        return [record.data() for record in result.records]
+
+    async def iter_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream records from the knowledge graph as the driver delivers them.
+        If columns are provided, only those columns are materialized.
+        The synchronous driver runs in a thread executor and hands records 
+        over through a bounded queue, so memory stays constant regardless 
+        of the result size.
+        """
+        import asyncio
+        import threading
 
-        return records
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_STREAM_QUEUE_SIZE)
+        cancelled = threading.Event()
+        done = object()
+
+        def _put(item: Any) -> None:
+            asyncio.run_coroutine_threadsafe(queue.put(item), loop).result()
+
+        def _produce() -> None:
+            try:
+                with self.driver.session() as session:
+                    result = session.run(query, parameters)
+                    for record in result:
+                        if cancelled.is_set():
+                            break
+                        _put(record.data(*columns) if columns else record.data())
+            except Exception as e:
+                _put(e)
+            finally:
+                if not cancelled.is_set():
+                    _put(done)
+
+        producer = loop.run_in_executor(None, _produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # unblock the producer if the consumer stopped early
+            cancelled.set()
+            while not queue.empty():
+                queue.get_nowait()
+            await producer
+
+    async def query_batch(
+        self,
+        query: str,
+        rows: List[Dict[str, Any]],
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Write rows to the knowledge graph in batches.
+        The query receives each batch as `$rows` i.e. `UNWIND $rows AS row`.
+        All batches share a single session (and executor hop) and every 
+        batch is committed in its own write transaction.
+        Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+
+        batch_size = max(1, batch_size)
+
+        def _write_batches() -> int:
+            written = 0
+            with self.driver.session() as session:
+                for start in range(0, len(rows), batch_size):
+                    batch = rows[start:start + batch_size]
+                    session.execute_write(
+                        lambda tx: tx.run(query, rows=batch).consume()
+                    )
+                    written += len(batch)
+            return written
+
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _write_batches)
 
     async def search(
         self,
@@ -0,0 +1,194 @@
+from typing import List, Dict, Any, Optional, AsyncIterator
+from datetime import datetime
+from pydantic import BaseModel
+
+from neo4j import AsyncGraphDatabase
+
+from service.config.typex import IConfigService
+
+# compliant with IGraphService protocol
+# this is the native async counterpart of Neo4jGraphService:
+# it uses the async Neo4j driver and async sessions, so queries
+# do not hop through the default thread executor. The connection
+# pool size and acquisition timeout are configurable to cap the
+# number of concurrent agent sessions hitting the database.
+# it is meant to be a drop-in replacement for Neo4jGraphService
+class AsyncNeo4jGraphService:
+    def __init__(self, config_service: IConfigService):
+        self.config_service = config_service
+        uri = self.config_service.get_neo4j_uri()
+        user = self.config_service.get_neo4j_user()
+        password = self.config_service.get_neo4j_password()
+        self.driver = AsyncGraphDatabase.driver(
+            uri,
+            auth=(user, password),
+            max_connection_pool_size=self.config_service.get_neo4j_max_pool_size(),
+            connection_acquisition_timeout=self.config_service.get_neo4j_acquisition_timeout()
+        )
+
+    def expose_driver(self) -> Any:
+        """Expose the driver for the graph service."""
+        return self.driver
+
+    async def add_episode(
+        self,
+        episode_id: str,
+        content: str,
+        source: str,
+        timestamp: Optional[datetime] = None,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Add an episode to the knowledge graph.
+        Assume that the content is the Cypher query
+        Ignore everything else
+        """
+        return None
+
+    async def add_episode_aux(
+        self,
+        name: str,
+        episode_body: str,
+        source_description: str,
+        reference_time: datetime,
+        source: Any = None,
+        group_id: str | None = None,
+        uuid: str | None = None,
+        update_communities: bool = False,
+        entity_types: dict[str, BaseModel] | None = None,
+        excluded_entity_types: list[str] | None = None,
+        previous_episode_uuids: list[str] | None = None,
+        edge_types: dict[str, BaseModel] | None = None,
+        edge_type_map: dict[tuple[str, str], list[str]] | None = None,
+    ) -> None:
+        """
+        Not implemented in this service.
+        Add an aux episode to the knowledge graph."""
+        return None
+
+    async def query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> tuple[List[Any], List[str]]:
+        """
+        Query the knowledge graph.
+        This is used for writing or reading data
+        """
+        async with self.driver.session() as session:
+            result = await session.run(query, parameters)
+            # Convert Neo4j Records to dictionaries as they arrive
+            return [record.data() async for record in result]
+
+    async def iter_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream records from the knowledge graph as the driver delivers them.
+        If columns are provided, only those columns are materialized.
+        """
+        async with self.driver.session() as session:
+            result = await session.run(query, parameters)
+            async for record in result:
+                yield record.data(*columns) if columns else record.data()
+
+    async def query_batch(
+        self,
+        query: str,
+        rows: List[Dict[str, Any]],
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Write rows to the knowledge graph in batches.
+        The query receives each batch as `$rows` i.e. `UNWIND $rows AS row`.
+        All batches share a single session and every batch is
+        committed in its own write transaction.
+        Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+
+        batch_size = max(1, batch_size)
+
+        async def _write_batch(tx, batch: List[Dict[str, Any]]) -> None:
+            result = await tx.run(query, rows=batch)
+            await result.consume()
+
+        written = 0
+        async with self.driver.session() as session:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                await session.execute_write(_write_batch, batch)
+                written += len(batch)
+
+        return written
+
+    async def search(
+        self,
+        query: str,
+        excluded_entity_types: list[str] | None = None,
+        use_hybrid_search: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Not implemented in this service.
+        Search the knowledge graph.
+        """
+        return []
+
+    async def search_aux(
+        self,
+        query: str,
+        search_type: str,
+        custom_types: list[str] | None = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Not implemented in this service.
+        Search the knowledge graph using custom types."""
+        return []
+
+    async def get_related_entities(
+        self,
+        entity_name: str,
+        relationship_types: Optional[List[str]] = None,
+        depth: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Not implemented in this service.
+        Get entities related to a given entity.
+        """
+        return {}
+
+    async def get_entity_timeline(
+        self,
+        entity_name: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Not implemented in this service.
+        Get timeline of facts for an entity.
+        """
+        return []
+
+    async def get_graph_statistics(self) -> Dict[str, Any]:
+        """
+        Not implemented in this service.
+        Get statistics about the knowledge graph.
+        """
+        return {}
+
+    async def clear_graph(self) -> None:
+        """Clear the knowledge graph."""
+        async with self.driver.session() as session:
+            result = await session.run("MATCH (n) DETACH DELETE n")
+            await result.consume()
+
+    async def close(self):
+        await self.driver.close()
+
+    async def finalize(self) -> None:
+        """Destruct the service and close resources."""
+        await self.close()
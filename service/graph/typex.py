@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional, Protocol
+from typing import List, Dict, Any, Optional, Protocol, AsyncIterator
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -50,6 +50,30 @@ class IGraphService(Protocol):
         """
         pass
 
+    def iter_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream records from the knowledge graph as the driver delivers them.
+        If columns are provided, only those columns are materialized.
+        """
+        pass
+
+    async def query_batch(
+        self,
+        query: str,
+        rows: List[Dict[str, Any]],
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Write rows to the knowledge graph in batches.
+        The query receives each batch as `$rows` i.e. `UNWIND $rows AS row`.
+        """
+        pass
+
     async def search(
         self,
         query: str,
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Optional, AsyncIterator, Callable
 from datetime import datetime, timezone
 import asyncio
 
@@ -6,6 +6,7 @@ from .typex import IngestionResult
 from service.config.typex import IConfigService
 from service.crawl.typex import ICrawlService
 from service.chunker.typex import IChunkerService, DocumentChunk
+from service.chunker.parallel import ParallelChunker
 from service.graph.typex import IGraphService
 
 # compliant with IRAGService protocol
@@ -15,33 +16,100 @@ class GraphRAGService:
         self.crawl_service = crawl_service
         self.chunker_service = chunker_service
         self.graph_service = graph_service
+        # chunks docs in worker processes ahead of the graph ingestion
+        self.parallel_chunker = ParallelChunker(config_service, chunker_service)
 
     async def ingest_md_urls(self, urls: str, progress_callback: Optional[callable] = None) -> List[IngestionResult]:
-        # Clear graph
-        await self.graph_service.clear_graph()
+        # Clear graph unless an interrupted crawl resumes on top of the docs it already inserted
+        if self.crawl_service.has_pending_job(urls, max_depth=1):
+            print("Resuming an interrupted ingest - keeping the existing graph")
+        else:
+            await self.graph_service.clear_graph()
 
         print(f"Received the following URLs to crawl and vectorize: {urls}")
-        crawl_results = []
-        crawl_results.extend(await self.crawl_service.crawl(urls, max_depth=1, max_concurrent=10))
 
-        results = []
+        # Chunk and insert docs as they are crawled so that ingestion overlaps fetching;
+        # docs are chunked ahead, so crawled URLs are completed only once in the graph
+        docs = self.crawl_service.crawl_stream(urls, max_depth=1, max_concurrent=10, defer_completion=True)
+        results = await self._ingest_docs(docs, lambda: len(urls), "gr:ingest_md_urls", progress_callback)
 
-        # Initialize RAG instance and insert docs
-        for i, doc in enumerate(crawl_results):
-            url = doc['url']
-            md = doc['markdown']
-            if not md:
-                print(f"Skipping {url} - no markdown content found")
-                continue
-            print(f"Inserting document from {url} into RAG...")
+        self._print_crawl_stats()
+        return results
+
+    async def ingest_md_url_batches(
+            self,
+            url_batches: AsyncIterator[List[str]],
+            job_id: str,
+            progress_callback: Optional[callable] = None) -> List[IngestionResult]:
+        """
+        Ingest MD URLs discovered in batches i.e. one per repo. Every batch is
+        crawled as soon as it is discovered, but the graph is only cleared once
+        all batches were discovered: if discovery fails, the ingest aborts and
+        leaves the graph untouched.
+        """
+        # Keep the graph if an interrupted crawl resumes on top of the docs it already inserted
+        resumed = self.crawl_service.has_pending_job([], max_depth=1, job_id=job_id)
+        if resumed:
+            print("Resuming an interrupted ingest - keeping the existing graph")
 
-            results.append(await self._ingest_single_document(md))
+        # Discovery runs ahead of the crawl, so its failures surface before the graph is cleared
+        urls = []
+        batches: asyncio.Queue = asyncio.Queue()
 
-            if progress_callback:
-                progress_callback("gr:ingest_md_urls", i, len(crawl_results))
+        async def _discover() -> None:
+            try:
+                async for batch in url_batches:
+                    print(f"Received the following URLs to crawl and vectorize: {batch}")
+                    urls.extend(batch)
+                    await batches.put(batch)
+            finally:
+                await batches.put(None)
+
+        async def _iter_batches() -> AsyncIterator[List[str]]:
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    return
+                yield batch
+
+        async def _prepare_graph() -> None:
+            await discovery
+            if not resumed:
+                await self.graph_service.clear_graph()
 
+        async def _iter_docs() -> AsyncIterator[Dict[str, str]]:
+            # Docs are crawled while slower repos are still discovered
+            # but inserted only once the graph is ready for them
+            prepared = False
+            docs = self.crawl_service.crawl_stream(_iter_batches(), max_depth=1, max_concurrent=10, job_id=job_id, defer_completion=True)
+            async for doc in docs:
+                if not prepared:
+                    await _prepare_graph()
+                    prepared = True
+                yield doc
+            if not prepared:
+                await _prepare_graph()
+
+        discovery = asyncio.create_task(_discover())
+        try:
+            results = await self._ingest_docs(_iter_docs(), lambda: len(urls), "gr:ingest_md_url_batches", progress_callback)
+        finally:
+            discovery.cancel()
+
+        self._print_crawl_stats()
         return results
 
+    async def ingest_md_docs(self, docs: List[Dict[str, str]], progress_callback: Optional[callable] = None) -> List[IngestionResult]:
+        await self.graph_service.clear_graph()
+
+        print(f"Received {len(docs)} docs to vectorize")
+
+        async def _iter_docs() -> AsyncIterator[Dict[str, str]]:
+            for doc in docs:
+                yield doc
+
+        return await self._ingest_docs(_iter_docs(), lambda: len(docs), "gr:ingest_md_docs", progress_callback)
+
     async def ingest_pdf_files(self, filespath: str, progress_callback: Optional[callable] = None) -> List[IngestionResult]:
         if progress_callback:
             progress_callback("gr:ingest_pdf_files", 0, 1)
@@ -70,6 +138,10 @@ class GraphRAGService:
             errors=[]
         )]
 
+    async def warm_up(self) -> None:
+        """Nothing to load ahead of the first retrieval."""
+        return None
+
     async def retrieve(self, query: str) -> str:
         """Retrieve relevant documents from GraphRAG based on a search query.
         
@@ -82,23 +154,60 @@ class GraphRAGService:
         """
         return ""
 
-    def finalize(self) -> None:
+    async def finalize(self) -> None:
         """Destruct the service and close resources."""
-        return None
+        self.parallel_chunker.finalize()
+
+    async def _ingest_docs(
+            self,
+            docs: AsyncIterator[Dict[str, str]],
+            get_total: Callable[[], int],
+            ingestor: str,
+            progress_callback: Optional[callable] = None) -> List[IngestionResult]:
+        results = []
+        i = 0
+        # Docs are chunked in parallel ahead of the graph ingestion and come back in order
+        async for doc, chunks in self.parallel_chunker.iter_chunked_docs(docs):
+            url = doc['url']
+            complete = doc.get('complete')
+            if not doc['markdown']:
+                print(f"Skipping {url} - no markdown content found")
+                if complete:
+                    complete()
+                continue
+            print(f"Inserting document from {url} into RAG...")
+
+            results.append(await self._ingest_single_document(source=url, title=url, chunks=chunks))
+            # The doc is in the graph: complete its crawl frontier entry
+            if complete:
+                complete()
+
+            if progress_callback:
+                progress_callback(ingestor, i, get_total())
+            i += 1
+
+        cache_stats = self.chunker_service.get_cache_stats()
+        print(f"Chunk split cache stats: {cache_stats.hits} hits, {cache_stats.misses} misses "
+              f"({cache_stats.hit_rate:.0%} hit rate) - {cache_stats.hits} LLM calls avoided")
+        return results
+
+    def _print_crawl_stats(self) -> None:
+        print(f"Crawl cache stats: {self.crawl_service.get_cache_stats()}")
+        for host, stats in self.crawl_service.get_host_stats().items():
+            print(f"Crawl host stats: {host} - {stats.completed} requests, {stats.throttled} throttled, {stats.avg_latency_ms:.0f}ms avg latency")
 
     async def _ingest_single_document(
             self, 
             source: str, 
             title: str, 
-            content: str,
-            metadata: Optional[Dict[str, Any]] = None) -> IngestionResult:
+            chunks: List[DocumentChunk]) -> IngestionResult:
         """
-        Ingest a single document.
+        Ingest a single chunked document.
         
         Args:
             source
             title
-            content
+            chunks
         
         Returns:
             Ingestion result
@@ -106,14 +215,6 @@ class GraphRAGService:
         start_time = datetime.now()
         document_id = f"{source}_{title}_{datetime.now().timestamp()}"
 
-        # Chunk the document
-        chunks = await self.chunker_service.chunk_document(
-            content=content,
-            title=title,
-            source=source,
-            metadata=metadata
-        )
-        
         if not chunks:
             return IngestionResult(
                 document_id=document_id,
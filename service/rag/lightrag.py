@@ -1,5 +1,8 @@
 import os
-from typing import List, Callable, Optional
+import asyncio
+from dataclasses import dataclass
+from typing import List, Dict, Set, Callable, Awaitable, Optional, AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 from lightrag import LightRAG, QueryParam
@@ -8,7 +11,6 @@ from lightrag.kg.shared_storage import initialize_pipeline_status
 import numpy as np
 from google import genai
 from google.genai import types
-from sentence_transformers import SentenceTransformer
 
 from lightrag import LightRAG
 from lightrag.llm.openai import openai_complete, gpt_4o_mini_complete, openai_embed
@@ -16,8 +18,22 @@ from lightrag.llm.ollama import ollama_model_complete, ollama_embed
 from lightrag.utils import EmbeddingFunc
 
 from .typex import IngestionResult
+from .manifest import DocManifest, IngestedDoc, get_doc_id, hash_doc_content
+from .versions import WorkDirVersions
 from service.config.typex import IConfigService
 from service.crawl.typex import ICrawlService
+from service.embedder.local import encode_texts
+
+@dataclass
+class _PendingDoc:
+    """Represents a document waiting to be inserted."""
+    url: str
+    markdown: str
+    doc_id: str
+    content_hash: str
+    previous_doc_id: Optional[str] = None
+    # completes the doc's crawl frontier entry once the doc is committed
+    complete: Optional[Callable[[], None]] = None
 
 # dictionary to map llm types to a callable function that returns a LightRAG instance
 _LLM_LIGHTRAG = dict[str, Callable[..., LightRAG]]
@@ -32,53 +48,78 @@ class LightRAGService:
             "gemini": self._get_gemini_lightrag_instance,
             "ollama": self._get_ollama_lightrag_instance
         }
+        self.versions = WorkDirVersions(self.config_service.get_lightrag_work_dir())
+        # LightRAG instance serving retrieval and the version it was loaded from
         self.rag = None
-
-    def finalize(self) -> None:
+        self.rag_version = None
+        self.reload_lock = asyncio.Lock()
+        # in-flight calls per LightRAG instance (by id), and the replaced
+        # instances that are finalized once their last call is done
+        self.rag_calls: Dict[int, int] = {}
+        self.retired_rags: Dict[int, LightRAG] = {}
+        self.gemini_client = None
+        self.gemini_semaphore = None
+
+    async def finalize(self) -> None:
         """Destruct the service and close resources."""
-        return None
-
-    async def ingest_md_urls(self, urls: str, progress_callback: Optional[callable] = None) -> List[IngestionResult]:
-        await self._initialize()
-
-        # Check if get_lightrag_working_dir() exists, delete and recreate it
-        if os.path.exists(self.config_service.get_lightrag_work_dir()):
-            import shutil
-            shutil.rmtree(self.config_service.get_lightrag_work_dir())
-        os.mkdir(self.config_service.get_lightrag_work_dir())
-        
+        if self.rag is not None:
+            await self.rag.finalize_storages()
+            self.rag = self.rag_version = None
+
+        for rag in self.retired_rags.values():
+            await rag.finalize_storages()
+        self.retired_rags.clear()
+
+        if self.gemini_client is not None:
+            await self.gemini_client.aio.aclose()
+            self.gemini_client = None
+
+    async def ingest_md_urls(
+        self,
+        urls: str,
+        progress_callback: Optional[callable] = None,
+        corpus_urls: Optional[List[str]] = None
+    ) -> List[IngestionResult]:
+        """
+        Crawl and ingest MD URLs into a new version. Docs of the current version
+        that are not in `corpus_urls` (the crawled URLs by default) are purged,
+        so that an incremental ingest crawls only the changed docs.
+        """
         print(f"Received the following URLs to crawl and vectorize: {urls}")
-        crawl_results = []
-        crawl_results.extend(await self.crawl_service.crawl(urls, max_depth=1, max_concurrent=10))
 
-        results = []    
+        async def _ingest(rag: LightRAG, work_dir: str) -> List[IngestionResult]:
+            # Insert docs as they are crawled so that insertion overlaps fetching;
+            # crawled URLs are completed only once their batch is committed
+            docs = self.crawl_service.crawl_stream(urls, max_depth=1, max_concurrent=10, defer_completion=True)
+            return await self._insert_docs(rag, work_dir, docs, len(urls), set(corpus_urls or urls), "lr:ingest_md_urls", progress_callback)
 
-        # Initialize RAG instance and insert docs
-        for i, doc in enumerate(crawl_results):
-            url = doc['url']
-            md = doc['markdown']
-            if not md:
-                print(f"Skipping {url} - no markdown content found")
-                continue
-            print(f"Inserting document from {url} into RAG...")
+        results = await self._build_version(_ingest)
 
-            start_time = datetime.now()
-            await self.rag.ainsert(md)
+        print(f"Crawl cache stats: {self.crawl_service.get_cache_stats()}")
+        for host, stats in self.crawl_service.get_host_stats().items():
+            print(f"Crawl host stats: {host} - {stats.completed} requests, {stats.throttled} throttled, {stats.avg_latency_ms:.0f}ms avg latency")
+        return results
 
-            if progress_callback:
-                progress_callback("lr:ingest_md_urls", i, len(crawl_results))
+    async def ingest_md_docs(
+        self,
+        docs: List[Dict[str, str]],
+        progress_callback: Optional[callable] = None,
+        corpus_urls: Optional[List[str]] = None
+    ) -> List[IngestionResult]:
+        """
+        Ingest already fetched MD docs into a new version. Docs of the current
+        version that are not in `corpus_urls` (the docs URLs by default) are purged.
+        """
+        print(f"Received {len(docs)} docs to vectorize")
 
-            results.append(IngestionResult(
-                document_id=url,
-                title=url,
-                chunks_created=1,  # Assuming one chunk per document for simplicity
-                entities_extracted=0,
-                relationships_created=0,
-                processing_time_ms=(datetime.now() - start_time).total_seconds() * 1000,
-                errors=[]
-            ))    
+        async def _iter_docs() -> AsyncIterator[Dict[str, str]]:
+            for doc in docs:
+                yield doc
 
-        return results
+        async def _ingest(rag: LightRAG, work_dir: str) -> List[IngestionResult]:
+            return await self._insert_docs(rag, work_dir, _iter_docs(), len(docs), set(corpus_urls or [doc['url'] for doc in docs]), "lr:ingest_md_docs", progress_callback)
+
+        return await self._build_version(_ingest)
 
     async def ingest_pdf_files(self, filespath: str, progress_callback: Optional[callable] = None) -> List[IngestionResult]:
         await self._initialize()
@@ -121,49 +162,344 @@ class LightRAGService:
         Returns:
             Formatted context information from the retrieved documents.
         """
-        await self._initialize()
+        # Hot-reload onto the current version if a build switched it
+        async with self._serving_rag() as rag:
+            # Check if get_lightrag_working_dir() has no built version, throw an error
+            if rag is None:
+                raise ValueError(f"RAG work dir: {self.config_service.get_lightrag_work_dir()} has no built version.")
 
-        # Check if get_lightrag_working_dir() does not exists, throw an error
-        if not os.path.exists(self.config_service.get_lightrag_work_dir()):
-            raise ValueError(f"RAG work dir: {self.config_service.get_lightrag_work_dir()} does not exist.")
-        
-        return await self.rag.aquery(
-            query, param=QueryParam(mode="mix")
-        )
+            return await rag.aquery(
+                query, param=QueryParam(mode="mix")
+            )
+
+    async def warm_up(self) -> None:
+        """
+        Load the storages of the current version and run a throwaway query,
+        so that the first retrieval lands on a hot index.
+        """
+        start_time = datetime.now()
+        try:
+            await self._initialize()
+        except Exception as e:
+            print(f"LightRAG warm-up failed: {e}")
+            return
+
+        load_time_ms = (datetime.now() - start_time).total_seconds() * 1000
+
+        async with self._serving_rag() as rag:
+            if rag is None:
+                print("LightRAG warm-up skipped - no built version yet")
+                return
+
+            # context-only naive query: loads the embedding model and vector index without any LLM call
+            start_time = datetime.now()
+            try:
+                await rag.aquery("warm-up", param=QueryParam(mode="naive", only_need_context=True))
+            except Exception as e:
+                print(f"LightRAG warm-up query failed: {e}")
+            query_time_ms = (datetime.now() - start_time).total_seconds() * 1000
+
+        print(f"LightRAG version {self.rag_version} warmed up: storages loaded in {load_time_ms:.0f}ms, throwaway query in {query_time_ms:.0f}ms")
+
+    def get_current_version(self) -> Optional[str]:
+        """Get the LightRAG version currently served."""
+        return self.versions.current()
+
+    def rollback(self) -> Optional[str]:
+        """Switch back to the previous LightRAG version. Retrieval hot-reloads onto it."""
+        return self.versions.rollback()
 
     ### PRIVATE FUNCTIONS ###
+    async def _build_version(self, ingest: Callable[[LightRAG, str], Awaitable[List[IngestionResult]]]) -> List[IngestionResult]:
+        # Build into a new version dir while the current version keeps serving
+        version, work_dir, resumed = self.versions.create()
+        print(f"{'Resuming' if resumed else 'Building'} LightRAG version {version} in {work_dir}...")
+
+        rag = self._get_lightrag_instance(version)
+        await rag.initialize_storages()
+        await initialize_pipeline_status()
+        try:
+            results = await ingest(rag, work_dir)
+        finally:
+            # Flush the storages of the build
+            await rag.finalize_storages()
+
+        # Switch readers onto the complete build and drop old versions
+        self.versions.activate(version)
+        pruned = self.versions.prune(self.config_service.get_lightrag_keep_versions())
+        print(f"Switched LightRAG to version {version} (pruned {len(pruned)} old versions)")
+        return results
+
+    async def _insert_docs(
+        self,
+        rag: LightRAG,
+        work_dir: str,
+        docs: AsyncIterator[Dict[str, str]],
+        total: int,
+        corpus_urls: Set[str],
+        ingestor: str,
+        progress_callback: Optional[callable] = None
+    ) -> List[IngestionResult]:
+        # docs are tracked by URL and content hash in a manifest next to the RAG storages
+        manifest = DocManifest(work_dir)
+        batch_size = self.config_service.get_lightrag_config().insert_batch_size
+        results = []
+        inserted = replaced = unchanged = 0
+
+        # docs are inserted in batches; the next batch is collected
+        # (i.e. crawled) while the previous one is being inserted
+        batch: List[_PendingDoc] = []
+        insert_task = None
+
+        async def _flush(batch: List[_PendingDoc]) -> None:
+            nonlocal insert_task
+            if insert_task is not None:
+                results.extend(await insert_task)
+                if progress_callback:
+                    progress_callback(ingestor, len(results), total)
+            insert_task = asyncio.create_task(self._insert_batch(rag, manifest, batch)) if batch else None
+
+        try:
+            async for doc in docs:
+                url = doc['url']
+                md = doc['markdown']
+                complete = doc.get('complete')
+                if not md:
+                    print(f"Skipping {url} - no markdown content found")
+                    results.append(self._get_skipped_result(url, ""))
+                    if complete:
+                        complete()
+                    continue
+
+                content_hash = hash_doc_content(md)
+                ingested = manifest.get(url)
+                if ingested and ingested.content_hash == content_hash:
+                    print(f"Skipping {url} - unchanged since the last ingest")
+                    results.append(self._get_skipped_result(url, ingested.doc_id))
+                    unchanged += 1
+                    if complete:
+                        complete()
+                    continue
+
+                if ingested:
+                    print(f"Replacing document from {url} in RAG...")
+                    replaced += 1
+                else:
+                    print(f"Inserting document from {url} into RAG...")
+                    inserted += 1
+
+                batch.append(_PendingDoc(
+                    url=url,
+                    markdown=md,
+                    doc_id=get_doc_id(url),
+                    content_hash=content_hash,
+                    previous_doc_id=ingested.doc_id if ingested else None,
+                    complete=complete
+                ))
+                if len(batch) >= batch_size:
+                    await _flush(batch)
+                    batch = []
+
+            await _flush(batch)
+            await _flush([])
+        finally:
+            # Never orphan the batch in flight i.e. when the crawl fails: let it commit
+            if insert_task is not None:
+                await asyncio.gather(insert_task, return_exceptions=True)
+
+        # Purge docs that are no longer part of the corpus
+        purged = 0
+        for url in [url for url in manifest.docs if url not in corpus_urls]:
+            print(f"Purging document from {url} from RAG...")
+            await rag.adelete_by_doc_id(manifest.get(url).doc_id)
+            manifest.remove(url)
+            purged += 1
+
+        print(f"Ingest summary: {inserted} inserted, {replaced} replaced, {unchanged} unchanged, {purged} purged")
+        return results
+
+    async def _insert_batch(self, rag: LightRAG, manifest: DocManifest, batch: List[_PendingDoc]) -> List[IngestionResult]:
+        start_time = datetime.now()
+
+        # Changed docs: drop their previous version before re-inserting them
+        for doc in batch:
+            if doc.previous_doc_id:
+                await rag.adelete_by_doc_id(doc.previous_doc_id)
+
+        await rag.ainsert(
+            [doc.markdown for doc in batch],
+            ids=[doc.doc_id for doc in batch],
+            file_paths=[doc.url for doc in batch]
+        )
+        batch_time_ms = (datetime.now() - start_time).total_seconds() * 1000
+        statuses = await self._get_doc_statuses(rag, [doc.doc_id for doc in batch])
+
+        results = []
+        ingested = {}
+        for doc in batch:
+            status = statuses.get(doc.doc_id) or {}
+            errors = []
+            if status.get("status") == "failed":
+                errors.append(status.get("error_msg") or status.get("error") or "Document processing failed")
+            else:
+                # Only processed docs are recorded so that failed ones are retried
+                ingested[doc.url] = IngestedDoc(doc_id=doc.doc_id, content_hash=doc.content_hash)
+
+            results.append(IngestionResult(
+                document_id=doc.doc_id,
+                title=doc.url,
+                chunks_created=status.get("chunks_count", 1),
+                entities_extracted=0,
+                relationships_created=0,
+                processing_time_ms=self._get_doc_processing_time_ms(status, batch_time_ms),
+                errors=errors,
+                source=doc.url
+            ))
+
+        manifest.update(ingested)
+
+        # The batch is committed: complete the crawl frontier entries of its docs
+        for doc in batch:
+            if doc.complete:
+                doc.complete()
+
+        print(f"Inserted a batch of {len(batch)} documents in {batch_time_ms:.0f}ms")
+        return results
+
+    def _get_skipped_result(self, url: str, doc_id: str) -> IngestionResult:
+        # Skipped docs need no work but are reported, so callers know they are up to date
+        return IngestionResult(
+            document_id=doc_id,
+            title=url,
+            chunks_created=0,
+            entities_extracted=0,
+            relationships_created=0,
+            processing_time_ms=0.0,
+            source=url
+        )
+
+    async def _get_doc_statuses(self, rag: LightRAG, doc_ids: List[str]) -> Dict[str, Dict]:
+        # LightRAG records the processing status of every doc in its doc status storage
+        try:
+            statuses = await rag.doc_status.get_by_ids(doc_ids)
+        except Exception as e:
+            print(f"Failed to get document statuses: {e}")
+            return {}
+
+        return {doc_id: status for doc_id, status in zip(doc_ids, statuses) if isinstance(status, dict)}
+
+    def _get_doc_processing_time_ms(self, status: Dict, batch_time_ms: float) -> float:
+        # Per-doc time from the doc status timestamps, otherwise the batch time
+        try:
+            created_at = datetime.fromisoformat(status["created_at"])
+            updated_at = datetime.fromisoformat(status["updated_at"])
+            return (updated_at - created_at).total_seconds() * 1000
+        except (KeyError, TypeError, ValueError):
+            return batch_time_ms
+
+    def _get_lightrag_kwargs(self) -> Dict:
+        """Get the LightRAG throughput knobs."""
+        lightrag_config = self.config_service.get_lightrag_config()
+        return {
+            "max_parallel_insert": lightrag_config.max_parallel_insert,
+            "llm_model_max_async": lightrag_config.llm_max_async,
+            "embedding_batch_num": lightrag_config.embedding_batch_num,
+            "embedding_func_max_async": lightrag_config.embedding_max_async,
+            "chunk_token_size": lightrag_config.chunk_token_size,
+            "chunk_overlap_token_size": lightrag_config.chunk_overlap_token_size,
+        }
+
     async def _initialize(self) -> None:
-        # Lazy-load rag
-        if self.rag is not None:
-            print("LightRAG instance already initialized.")
+        # Lazy-load rag from the current version, reloading it when a build switched versions
+        version = self.versions.current()
+        if version is None and self.versions.has_legacy_files():
+            # Unversioned work dir from before blue/green builds: it becomes the first version
+            async with self.reload_lock:
+                version = self.versions.current()
+                if version is None:
+                    version = self.versions.migrate_legacy()
+                    print(f"Migrated the unversioned LightRAG work dir to version {version}")
+        if version is None or version == self.rag_version:
             return
 
-        self.rag = self._get_lightrag_instance()
-        await self.rag.initialize_storages()
-        await initialize_pipeline_status()
+        async with self.reload_lock:
+            if version == self.rag_version:
+                return
+
+            start_time = datetime.now()
+            rag = self._get_lightrag_instance(version)
+            await rag.initialize_storages()
+            await initialize_pipeline_status()
+
+            previous_rag = self.rag
+            self.rag, self.rag_version = rag, version
+            print(f"LightRAG version {version} loaded in {(datetime.now() - start_time).total_seconds() * 1000:.0f}ms")
+
+            if previous_rag is not None:
+                await self._retire_rag(previous_rag)
+
+    @asynccontextmanager
+    async def _serving_rag(self) -> AsyncIterator[Optional[LightRAG]]:
+        # Hold the current instance for the duration of a call, so that a
+        # hot-reload finalizes the instance it replaces only once drained
+        await self._initialize()
+        rag = self.rag
+        if rag is None:
+            yield None
+            return
 
-    def _get_lightrag_instance(self) -> LightRAG:
+        self.rag_calls[id(rag)] = self.rag_calls.get(id(rag), 0) + 1
+        try:
+            yield rag
+        finally:
+            self.rag_calls[id(rag)] -= 1
+            if not self.rag_calls[id(rag)]:
+                del self.rag_calls[id(rag)]
+                if self.retired_rags.pop(id(rag), None) is not None:
+                    await rag.finalize_storages()
+
+    async def _retire_rag(self, rag: LightRAG) -> None:
+        # Finalize a replaced instance now, or after its last in-flight call
+        if id(rag) in self.rag_calls:
+            self.retired_rags[id(rag)] = rag
+        else:
+            await rag.finalize_storages()
+
+    def _get_lightrag_workspace_kwargs(self, version: str) -> Dict:
+        """
+        Get the storage location of a version. LightRAG shares storage data
+        across the process by workspace, so every version is its own
+        workspace: its storages live in the version dir under the versions dir.
+        """
+        return {
+            "working_dir": self.versions.versions_dir,
+            "workspace": version,
+        }
+
+    def _get_lightrag_instance(self, version: str) -> LightRAG:
         """Get the function based on the LLM type."""
         if self.config_service.get_lightrag_llm_type() not in self._llm_lightrag_istances:
             raise ValueError(f"Unsupported LLM type: {self.config_service.get_lightrag_llm_type()}")
 
-        return self._llm_lightrag_istances[self.config_service.get_lightrag_llm_type()]()
+        return self._llm_lightrag_istances[self.config_service.get_lightrag_llm_type()](version)
 
     # from source code: lightrag -> examples -> lightrag_openai_demo.py
-    def _get_openai_lightrag_instance(self) -> LightRAG:
+    def _get_openai_lightrag_instance(self, version: str) -> LightRAG:
         """Get an instance of LightRAG."""
         return LightRAG(
-            working_dir=self.config_service.get_lightrag_work_dir(),
+            **self._get_lightrag_workspace_kwargs(version),
+            **self._get_lightrag_kwargs(),
             embedding_func=openai_embed,
             llm_model_func=openai_complete, # gpt_4o_mini_complete
             llm_model_name=os.getenv("LLM_MODEL"),
         )
 
     # from source code: lightrag -> examples -> lightrag_ollama_demo.py
-    def _get_ollama_lightrag_instance(self) -> LightRAG:
+    def _get_ollama_lightrag_instance(self, version: str) -> LightRAG:
         """Get an instance of LightRAG."""
         return LightRAG(
-            working_dir=self.config_service.get_lightrag_work_dir(),
+            **self._get_lightrag_workspace_kwargs(version),
+            **self._get_lightrag_kwargs(),
             llm_model_func=ollama_model_complete,
             llm_model_name=os.getenv("LLM_MODEL", "qwen2.5-coder:7b"),
             llm_model_max_token_size=8192,
@@ -183,12 +519,19 @@ class LightRAGService:
             ),
         )
 
+    def _get_gemini_client(self) -> genai.Client:
+        # Lazy-load a single client so that all LLM calls share its connections
+        if self.gemini_client is None:
+            self.gemini_client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+            self.gemini_semaphore = asyncio.Semaphore(self.config_service.get_lightrag_config().gemini_max_concurrent)
+        return self.gemini_client
+
     # from source code: lightrag -> examples -> lightrag_gemini_demo.py
     async def _gemini_model_func(self,
         prompt, system_prompt=None, history_messages=[], keyword_extraction=False, **kwargs
     ) -> str:
-        # 1. Initialize the GenAI Client with your Gemini API Key
-        client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"))
+        # 1. Reuse the shared GenAI Client (pooled connections)
+        client = self._get_gemini_client()
 
         # 2. Combine prompts: system prompt, history, and user prompt
         if history_messages is None:
@@ -205,27 +548,32 @@ class LightRAGService:
         # Finally, add the new user prompt
         combined_prompt += f"user: {prompt}"
 
-        # 3. Call the Gemini model
-        response = client.models.generate_content(
-            model=os.getenv("LLM_MODEL", "gemini-1.5-flash"),
-            contents=[combined_prompt],
-            config=types.GenerateContentConfig(max_output_tokens=500, temperature=0.1),
-        )
+        # 3. Call the Gemini model asynchronously, capping the in-flight calls
+        async with self.gemini_semaphore:
+            response = await client.aio.models.generate_content(
+                model=os.getenv("LLM_MODEL", "gemini-1.5-flash"),
+                contents=[combined_prompt],
+                config=types.GenerateContentConfig(max_output_tokens=500, temperature=0.1),
+            )
 
         # 4. Return the response text
         return response.text
 
 
     async def _gemini_embedding_func(self, texts: list[str]) -> np.ndarray:
-        model = SentenceTransformer(os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"))
-        embeddings = model.encode(texts, convert_to_numpy=True)
-        return embeddings
+        # the model is loaded once per process and encodes off the event loop
+        return await encode_texts(
+            os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+            texts,
+            self.config_service.get_embedded_local_batch_size()
+        )
 
     # from source code: lightrag -> examples -> lightrag_gemini_demo.py
-    def _get_gemini_lightrag_instance(self) -> LightRAG:
+    def _get_gemini_lightrag_instance(self, version: str) -> LightRAG:
         """Get an instance of LightRAG."""
         return  LightRAG(
-            working_dir=self.config_service.get_lightrag_work_dir(),
+            **self._get_lightrag_workspace_kwargs(version),
+            **self._get_lightrag_kwargs(),
             llm_model_func=self._gemini_model_func,
             embedding_func=EmbeddingFunc(
                 embedding_dim=384,
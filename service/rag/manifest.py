@@ -0,0 +1,51 @@
+from typing import Dict, Optional
+from dataclasses import dataclass, asdict
+import os
+import json
+import hashlib
+
+# name of the manifest file inside a RAG work dir
+MANIFEST_FILE_NAME = "ingested_docs.json"
+
+@dataclass
+class IngestedDoc:
+    """Represents a document ingested into a RAG."""
+    doc_id: str
+    content_hash: str
+
+def get_doc_id(url: str) -> str:
+    """Derive a stable RAG document id from the document URL."""
+    return f"doc-{hashlib.sha1(url.encode('utf-8')).hexdigest()}"
+
+def hash_doc_content(content: str) -> str:
+    """Hash document content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+# tracks the content hash of every document ingested into a RAG work dir
+# by source URL, so that re-ingests skip unchanged documents, replace
+# changed ones and purge removed ones instead of rebuilding everything.
+class DocManifest:
+    def __init__(self, work_dir: str):
+        self.path = os.path.join(work_dir, MANIFEST_FILE_NAME)
+        self.docs: Dict[str, IngestedDoc] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as file:
+                self.docs = {url: IngestedDoc(**doc) for url, doc in json.load(file).items()}
+
+    def get(self, url: str) -> Optional[IngestedDoc]:
+        return self.docs.get(url)
+
+    def update(self, docs: Dict[str, IngestedDoc]) -> None:
+        self.docs.update(docs)
+        self.save()
+
+    def remove(self, url: str) -> None:
+        self.docs.pop(url, None)
+        self.save()
+
+    def save(self) -> None:
+        """Write the manifest atomically so that a crash never leaves it half written."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({url: asdict(doc) for url, doc in self.docs.items()}, file, indent=2)
+        os.replace(tmp_path, self.path)
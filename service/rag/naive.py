@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Dict, Optional
 
 from .typex import IngestionResult
 from service.config.typex import IConfigService
@@ -26,6 +26,20 @@ class NaiveRAGService:
             errors=[]
         )]
 
+    async def ingest_md_docs(self, docs: List[Dict[str, str]], progress_callback: Optional[callable] = None) -> IngestionResult:
+        if progress_callback:
+            progress_callback("nv:ingest_md_docs", 0, 1)
+
+        return [IngestionResult(
+            document_id="",
+            title="",
+            chunks_created=0,
+            entities_extracted=0,
+            relationships_created=0,
+            processing_time_ms=0.0,
+            errors=[]
+        )]
+
     async def ingest_pdf_files(self, filespath: str, progress_callback: Optional[callable] = None) -> IngestionResult:
         if progress_callback:
             progress_callback("nv:ingest_pdf_files", 0, 1)
@@ -54,6 +68,10 @@ class NaiveRAGService:
             errors=[]
         )]
 
+    async def warm_up(self) -> None:
+        """Nothing to load ahead of the first retrieval."""
+        return None
+
     async def retrieve(self, query: str) -> str:
         """Retrieve relevant documents from Native based on a search query.
         
@@ -66,7 +84,7 @@ class NaiveRAGService:
         """
         return ""
 
-    def finalize(self) -> None:
+    async def finalize(self) -> None:
         """Destruct the service and close resources."""
         return None
 
@@ -1,4 +1,4 @@
-from typing import List, Protocol, Optional
+from typing import List, Dict, Protocol, Optional
 from dataclasses import dataclass, field
 
 @dataclass
@@ -10,6 +10,8 @@ class IngestionResult:
     relationships_created: int
     processing_time_ms: float
     errors: List[str] = field(default_factory=list)
+    # URL of the ingested document
+    source: str = ""
 
 # rag services must implement this protocol
 class IRAGService(Protocol): 
@@ -17,6 +19,10 @@ class IRAGService(Protocol):
         """Ingest MD URLS into knowledge base."""
         pass
 
+    async def ingest_md_docs(self, docs: List[Dict[str, str]], progress_callback: Optional[callable] = None) -> List[IngestionResult]:
+        """Ingest already fetched {url, markdown} MD docs into knowledge base."""
+        pass
+
     async def ingest_pdf_files(self, files: str, progress_callback: Optional[callable] = None) -> List[IngestionResult]:
         """Ingest PDF files into knowledge base."""
         pass
@@ -25,10 +31,14 @@ class IRAGService(Protocol):
         """Ingest TXT files into knowledge base."""
         pass
 
+    async def warm_up(self) -> None:
+        """Load the knowledge base ahead of the first retrieval."""
+        pass
+
     async def retrieve(query: str) -> str:
         """Retrieve relevant documents based on a search query."""
         pass
         
-    def finalize(self) -> None:
+    async def finalize(self) -> None:
         """Destruct the service and close resources."""
         pass
\ No newline at end of file
@@ -0,0 +1,133 @@
+from typing import List, Optional, Tuple
+import os
+import time
+import shutil
+
+# pointer file holding the name of the active version
+CURRENT_FILE_NAME = "CURRENT"
+# directory holding the versions
+VERSIONS_DIR_NAME = "versions"
+# marker of a version dir whose build did not complete yet
+BUILDING_FILE_NAME = ".building"
+
+# versioned RAG work dirs for blue/green index builds.
+# every build goes into its own version dir while the current version keeps
+# serving; once complete, the CURRENT pointer is switched atomically and
+# readers hot-reload onto it. Previous versions are kept for rollback.
+#
+# <root>/CURRENT            -> v1700000000000
+# <root>/versions/v1690000000000/
+# <root>/versions/v1700000000000/
+class WorkDirVersions:
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self.versions_dir = os.path.join(root_dir, VERSIONS_DIR_NAME)
+        self.current_path = os.path.join(root_dir, CURRENT_FILE_NAME)
+
+    def get_dir(self, version: str) -> str:
+        return os.path.join(self.versions_dir, version)
+
+    def list(self) -> List[str]:
+        """List the versions from oldest to newest."""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(name for name in os.listdir(self.versions_dir) if os.path.isdir(self.get_dir(name)))
+
+    def current(self) -> Optional[str]:
+        """Get the active version."""
+        try:
+            with open(self.current_path, "r", encoding="utf-8") as file:
+                version = file.read().strip()
+        except FileNotFoundError:
+            return None
+
+        return version if version and os.path.isdir(self.get_dir(version)) else None
+
+    def create(self) -> Tuple[str, str, bool]:
+        """
+        Create the version dir of a new build, seeded with a copy of the
+        current version so that builds stay incremental.
+        An interrupted build (still marked as building) is resumed instead.
+        Returns the version, its dir and whether it was resumed.
+        """
+        building = [version for version in self.list() if self._is_building(version)]
+        if building:
+            return building[-1], self.get_dir(building[-1]), True
+
+        current = self.current() or self.migrate_legacy()
+
+        version, work_dir = self._make_building_dir()
+        if current is not None:
+            shutil.copytree(self.get_dir(current), work_dir, dirs_exist_ok=True)
+        return version, work_dir, False
+
+    def migrate_legacy(self) -> Optional[str]:
+        """
+        Turn an unversioned work dir from before blue/green builds into the
+        current version, so that it keeps serving until the next build.
+        Returns the version, or None if there is nothing to migrate.
+        """
+        if self.current() is not None or not self.has_legacy_files():
+            return None
+
+        version, work_dir = self._make_building_dir()
+        shutil.copytree(self.root_dir, work_dir, ignore=shutil.ignore_patterns(VERSIONS_DIR_NAME, CURRENT_FILE_NAME), dirs_exist_ok=True)
+        self.activate(version)
+        return version
+
+    def activate(self, version: str) -> None:
+        """Switch the CURRENT pointer atomically."""
+        if self._is_building(version):
+            os.remove(os.path.join(self.get_dir(version), BUILDING_FILE_NAME))
+
+        tmp_path = f"{self.current_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(version)
+        os.replace(tmp_path, self.current_path)
+
+    def rollback(self) -> Optional[str]:
+        """Switch back to the version that preceded the current one."""
+        current = self.current()
+        previous = [
+            version for version in self.list()
+            if (current is None or version < current) and not self._is_building(version)
+        ]
+        if not previous:
+            return None
+
+        self.activate(previous[-1])
+        return previous[-1]
+
+    def prune(self, keep: int) -> List[str]:
+        """Delete all but the `keep` versions that precede the current one."""
+        current = self.current()
+        if current is None:
+            return []
+
+        previous = [version for version in self.list() if version < current]
+        pruned = previous[:max(0, len(previous) - keep)]
+        for version in pruned:
+            shutil.rmtree(self.get_dir(version), ignore_errors=True)
+        return pruned
+
+    def has_legacy_files(self) -> bool:
+        """Check whether the root dir holds an unversioned work dir from before blue/green builds."""
+        if not os.path.isdir(self.root_dir):
+            return False
+        return any(name not in (VERSIONS_DIR_NAME, CURRENT_FILE_NAME) for name in os.listdir(self.root_dir))
+
+    def _make_building_dir(self) -> Tuple[str, str]:
+        # Marked as building before anything is copied in, so that a copy
+        # that dies halfway is never served nor rolled back to
+        timestamp = int(time.time() * 1000)
+        while os.path.exists(self.get_dir(f"v{timestamp}")):
+            timestamp += 1
+
+        version = f"v{timestamp}"
+        work_dir = self.get_dir(version)
+        os.makedirs(work_dir)
+        open(os.path.join(work_dir, BUILDING_FILE_NAME), "w").close()
+        return version, work_dir
+
+    def _is_building(self, version: str) -> bool:
+        return os.path.exists(os.path.join(self.get_dir(version), BUILDING_FILE_NAME))
@@ -0,0 +1,68 @@
+from typing import List, Dict, Iterator, BinaryIO, Tuple
+import asyncio
+import tarfile
+import tempfile
+import httpx
+
+# paths skipped in repositories
+EXCLUDED_PATHS = ['.git/', 'node_modules/', '__pycache__/']
+
+# archives are spooled in memory up to this size, then on disk
+_SPOOL_MAX_SIZE = 32 * 1024 * 1024
+
+def iter_archive_md_files(fileobj: BinaryIO) -> Iterator[Tuple[str, str]]:
+    """
+    Stream-extract the .md files of a tar.gz repository archive.
+    Members are read sequentially, so the archive is never fully unpacked.
+
+    Args:
+        fileobj: The tar.gz archive.
+
+    Returns:
+        (path, markdown) pairs where the path is relative to the repo root.
+    """
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+
+            # archives wrap the repo in a single top-level folder i.e. owner-repo-sha/
+            path = member.name.split('/', 1)[1] if '/' in member.name else member.name
+            if not path.endswith('.md') or any(excluded in path for excluded in EXCLUDED_PATHS):
+                continue
+
+            file = tar.extractfile(member)
+            if file is None:
+                continue
+
+            yield path, file.read().decode("utf-8", errors="replace")
+
+async def get_archive_md_docs(
+    http_client: httpx.AsyncClient,
+    archive_url: str,
+    headers: Dict[str, str],
+    url_prefix: str
+) -> List[Dict[str, str]]:
+    """
+    Download a tar.gz repository archive in a single request and extract its .md files.
+
+    Args:
+        http_client: The HTTP client.
+        archive_url: The archive download URL.
+        headers: The request headers i.e. auth.
+        url_prefix: The prefix of the document URLs i.e. {repo_url}/{slug}.
+
+    Returns:
+        {url, markdown} records, the same shape the crawl service returns.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE) as spool:
+        async with http_client.stream("GET", archive_url, headers=headers, follow_redirects=True) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                spool.write(chunk)
+
+        spool.seek(0)
+        # Decompression is CPU bound: keep it off the event loop
+        files = await asyncio.to_thread(lambda: list(iter_archive_md_files(spool)))
+
+    return [{"url": f"{url_prefix}/{path}", "markdown": markdown} for path, markdown in files]
@@ -0,0 +1,85 @@
+from typing import List, Dict, AsyncIterator, Callable, Awaitable, TypeVar
+import asyncio
+
+T = TypeVar("T")
+
+# run a per-repo discovery across many repositories concurrently.
+# repos are processed under a bounded semaphore and each repo's items are
+# yielded (deduplicated by key against the ones already yielded) as soon as
+# the repo finishes, so consumers can start working before the slowest
+# repo is done. A repo that fails raises, since consumers that rebuild or
+# purge an index must never act on an incomplete corpus, unless
+# `skip_failed` is set i.e. for best-effort consumers.
+async def _iter_discovered(
+    discover_repo: Callable[[str], Awaitable[List[T]]],
+    repo_urls: List[str],
+    max_concurrent: int,
+    key: Callable[[T], str],
+    skip_failed: bool = False
+) -> AsyncIterator[List[T]]:
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+    repo_urls = list(dict.fromkeys(url.strip() for url in repo_urls if url.strip()))
+
+    async def discover(repo_url: str) -> tuple[str, List[T]]:
+        async with semaphore:
+            try:
+                return repo_url, await discover_repo(repo_url)
+            except Exception as e:
+                if not skip_failed:
+                    raise ValueError(f"Failed to discover md files of {repo_url}: {e}") from e
+                print(f"Failed to discover md files of {repo_url}: {e}")
+                return repo_url, []
+
+    tasks = [asyncio.create_task(discover(repo_url)) for repo_url in repo_urls]
+    seen = set()
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            repo_url, items = await next_done
+            new_items = []
+            for item in items:
+                if key(item) not in seen:
+                    seen.add(key(item))
+                    new_items.append(item)
+            print(f"Discovered {len(new_items)} md files in {repo_url}")
+            if new_items:
+                yield new_items
+    finally:
+        # Stop pending discoveries if the consumer stopped early or a repo failed
+        for task in tasks:
+            task.cancel()
+
+# discover markdown URLs across many repositories concurrently,
+# yielding each repo's new URLs as soon as the repo finishes.
+def iter_md_urls(
+    get_md_urls: Callable[[str], Awaitable[List[str]]],
+    repo_urls: List[str],
+    max_concurrent: int,
+    skip_failed: bool = False
+) -> AsyncIterator[List[str]]:
+    return _iter_discovered(get_md_urls, repo_urls, max_concurrent, key=lambda url: url, skip_failed=skip_failed)
+
+# discover markdown URLs across many repositories concurrently
+# and return them merged and deduplicated.
+async def get_all_md_urls(
+    get_md_urls: Callable[[str], Awaitable[List[str]]],
+    repo_urls: List[str],
+    max_concurrent: int,
+    skip_failed: bool = False
+) -> List[str]:
+    md_urls = []
+    async for batch in iter_md_urls(get_md_urls, repo_urls, max_concurrent, skip_failed):
+        md_urls.extend(batch)
+    return md_urls
+
+# fetch markdown docs ({url, markdown} records) across many repositories
+# concurrently and return them merged and deduplicated by URL.
+async def get_all_md_docs(
+    get_md_docs: Callable[[str], Awaitable[List[Dict[str, str]]]],
+    repo_urls: List[str],
+    max_concurrent: int,
+    skip_failed: bool = False
+) -> List[Dict[str, str]]:
+    md_docs = []
+    async for batch in _iter_discovered(get_md_docs, repo_urls, max_concurrent, key=lambda doc: doc["url"], skip_failed=skip_failed):
+        md_docs.extend(batch)
+    return md_docs
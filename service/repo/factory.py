@@ -0,0 +1,22 @@
+from typing import Callable, Dict
+
+from service.config.typex import IConfigService
+from .typex import IRepoService
+from .github import GithubRepoService
+from .gitlab import GitlabRepoService
+from .local import LocalRepoService
+
+# dictionary to map repo types to a callable function that returns a repo service
+_REPO_SERVICES: Dict[str, Callable[[IConfigService], IRepoService]] = {
+    "github": GithubRepoService,
+    "gitlab": GitlabRepoService,
+    "local": LocalRepoService
+}
+
+def get_repo_service(config_service: IConfigService) -> IRepoService:
+    """Get the repo service of the configured repo type. Defaults to Gitlab."""
+    return _REPO_SERVICES.get(config_service.get_repo_type(), GitlabRepoService)(config_service)
+
+def reads_md_docs(config_service: IConfigService) -> bool:
+    """Whether the repo .md docs are read directly instead of crawled: archive mode, and local repos in every mode."""
+    return config_service.get_repo_mode() == "archive" or config_service.get_repo_type() == "local"
@@ -1,15 +1,20 @@
 import re
 import os
 import httpx
-from typing import List
+from typing import List, Dict, AsyncIterator
 
 from service.config.typex import IConfigService
+from .discovery import iter_md_urls, get_all_md_urls, get_all_md_docs
+from .archive import get_archive_md_docs
+from .sync import RepoSyncState
+from .typex import RepoChanges
 
 # compliant with IRepoService protocol
 class GithubRepoService:
     def __init__(self, config_service: IConfigService):
         self.config_service = config_service
         self.http_client = httpx.AsyncClient()
+        self.sync_state = None
 
         if not self.config_service.get_github_token or not self.config_service.get_github_slug:
             raise ValueError("GITHUB_TOKEN and GITHUB_SLUG environment variables must be set")
@@ -62,5 +67,118 @@ class GithubRepoService:
         
         return structure
 
-    def finalize(self) -> None:
-        return None
+    async def get_md_docs(self, repo_url: str) -> List[Dict[str, str]]:
+        """
+        Get the .md files of a GitHub repository from its tarball
+        i.e. a single request instead of listing the tree and crawling each file.
+
+        Args:
+            repo_url: The GitHub repository URL.
+
+        Returns:
+            {url, markdown} records.
+        """
+        match = re.search(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?$', repo_url)
+        if not match:
+            raise ValueError("Invalid GitHub URL format")
+        
+        if not self.config_service.get_github_token():
+            raise ValueError("GITHUB_TOKEN environment variable must be set")
+
+        owner, repo = match.groups()
+        headers = {'Authorization': f'token {self.config_service.get_github_token()}'}
+
+        return await get_archive_md_docs(
+            self.http_client,
+            f'https://api.github.com/repos/{owner}/{repo}/tarball',
+            headers,
+            f"{repo_url}/{self.config_service.get_github_slug()}"
+        )
+
+    async def get_all_md_docs(self, repo_urls: List[str], skip_failed: bool = False) -> List[Dict[str, str]]:
+        """Get the .md files of many repositories concurrently from their archives."""
+        return await get_all_md_docs(self.get_md_docs, repo_urls, self.config_service.get_repo_max_concurrent(), skip_failed)
+
+    async def get_md_changes(self, repo_url: str) -> RepoChanges:
+        """
+        Get the .md files of a GitHub repository that changed since the last saved sync.
+        The head commit is resolved first so an unchanged repo costs a single request.
+        Otherwise the tree of the head commit is fetched and its blob SHAs are
+        diffed against the recorded ones.
+
+        Args:
+            repo_url: The GitHub repository URL.
+
+        Returns:
+            Added, modified and deleted .md URLs.
+        """
+        match = re.search(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?$', repo_url)
+        if not match:
+            raise ValueError("Invalid GitHub URL format")
+        
+        if not self.config_service.get_github_token():
+            raise ValueError("GITHUB_TOKEN environment variable must be set")
+
+        owner, repo = match.groups()
+        headers = {'Authorization': f'token {self.config_service.get_github_token()}'}
+        sync_state = self._get_sync_state()
+
+        # Resolve the head commit of main or master
+        commit_sha = None
+        for branch in ['main', 'master']:
+            response = await self.http_client.get(
+                f'https://api.github.com/repos/{owner}/{repo}/commits/{branch}',
+                headers={**headers, 'Accept': 'application/vnd.github.sha'}
+            )
+            if response.status_code == 200:
+                commit_sha = response.text.strip()
+                break
+
+        if not commit_sha:
+            raise ValueError(f"Failed to get repository head commit: {response.text}")
+
+        if commit_sha == sync_state.get_commit_sha(repo_url):
+            return sync_state.get_changes(repo_url, commit_sha, None)
+
+        response = await self.http_client.get(
+            f'https://api.github.com/repos/{owner}/{repo}/git/trees/{commit_sha}?recursive=1',
+            headers=headers
+        )
+        if response.status_code != 200:
+            raise ValueError(f"Failed to get repository structure: {response.text}")
+
+        blobs = {}
+        for item in response.json()['tree']:
+            if item['type'] == 'blob' and not any(excluded in item['path'] for excluded in ['.git/', 'node_modules/', '__pycache__/']):
+                if item['path'].endswith('.md'):
+                    blobs[f"{repo_url}/{self.config_service.get_github_slug()}/{item['path']}"] = item['sha']
+
+        return sync_state.get_changes(repo_url, commit_sha, blobs)
+
+    def save_md_changes(self, changes: RepoChanges) -> None:
+        """Record the repository snapshot once its changes were ingested."""
+        self._get_sync_state().save(changes)
+
+    def reset_md_changes(self) -> None:
+        """Forget the recorded snapshots, so that the next sync reports every markdown file as added."""
+        self._get_sync_state().clear()
+
+    async def get_all_md_urls(self, repo_urls: List[str], skip_failed: bool = False) -> List[str]:
+        """Get markdown URLs of many repositories concurrently, merged and deduplicated."""
+        return await get_all_md_urls(self.get_md_urls, repo_urls, self.config_service.get_repo_max_concurrent(), skip_failed)
+
+    def iter_md_urls(self, repo_urls: List[str], skip_failed: bool = False) -> AsyncIterator[List[str]]:
+        """Yield markdown URLs of many repositories concurrently as each repository completes."""
+        return iter_md_urls(self.get_md_urls, repo_urls, self.config_service.get_repo_max_concurrent(), skip_failed)
+
+    async def finalize(self) -> None:
+        """Destruct the service and close resources."""
+        if self.sync_state is not None:
+            self.sync_state.close()
+        await self.http_client.aclose()
+
+    def _get_sync_state(self) -> RepoSyncState:
+        # Lazy-load the sync state
+        if self.sync_state is None:
+            self.sync_state = RepoSyncState(self.config_service.get_repo_state_dir())
+        return self.sync_state
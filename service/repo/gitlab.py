@@ -1,19 +1,79 @@
 import re
 import os
+import asyncio
 import httpx
-from typing import List
+from typing import List, Dict, Optional, AsyncIterator
 
-http_client = httpx.AsyncClient()
+from .discovery import iter_md_urls, get_all_md_urls, get_all_md_docs
+from .archive import get_archive_md_docs
+from .sync import RepoSyncState
+from .typex import RepoChanges
 
 # compliant with IRepoService protocol
 class GitlabRepoService:
     def __init__(self, config_service):
         self.config_service = config_service
+        # pooled client shared by all repos listed by this service
         self.http_client = httpx.AsyncClient()
+        # caps the tree pages fetched concurrently across all repos
+        self.page_semaphore = asyncio.Semaphore(max(1, self.config_service.get_gitlab_max_concurrent_pages()))
+        self.sync_state = None
 
         if not self.config_service.get_gitlab_token() or not self.config_service.get_gitlab_slug() or not self.config_service.get_gitlab_base_url():
             raise ValueError("GITLAB_TOKEN, GITLAB_SLUG and GITLAB_BASE_URL environment variables must be set")
 
+    async def _get_tree_page(self, tree_url: str, headers: dict, page: int, per_page: int, ref: Optional[str] = None) -> httpx.Response:
+        """Get a single page of a repository tree."""
+        params = {"recursive": "true", "page": page, "per_page": per_page}
+        if ref:
+            params["ref"] = ref
+
+        async with self.page_semaphore:
+            response = await self.http_client.get(tree_url, headers=headers, params=params)
+
+        response.raise_for_status()
+        return response
+
+    def _get_page_md_items(self, data: List[dict]) -> List[dict]:
+        """Get the .md blob items of a page of tree items."""
+        items = []
+        for item in data:
+            if item.get('type') == 'blob' and not any(excluded in item['path'] for excluded in ['.git/', 'node_modules/', '__pycache__/']):
+                if item['path'].endswith('.md'):
+                    items.append(item)
+        return items
+
+    async def _get_md_items(self, tree_url: str, headers: dict, ref: Optional[str] = None) -> List[dict]:
+        """Get the .md blob items of a repository tree."""
+        per_page = 100
+
+        response = await self._get_tree_page(tree_url, headers, 1, per_page, ref)
+        items = self._get_page_md_items(response.json())
+
+        total_pages_header = response.headers.get('x-total-pages')
+        if total_pages_header:
+            # Total known upfront: fetch the remaining pages concurrently
+            responses = await asyncio.gather(*[
+                self._get_tree_page(tree_url, headers, page, per_page, ref)
+                for page in range(2, int(total_pages_header) + 1)
+            ])
+            for response in responses:
+                items.extend(self._get_page_md_items(response.json()))
+            return items
+
+        # Gitlab omits the totals on very large trees: follow the next pages
+        next_page_header = response.headers.get('x-next-page')
+        while next_page_header:
+            response = await self._get_tree_page(tree_url, headers, int(next_page_header), per_page, ref)
+            data = response.json()
+            if not data:
+                break
+
+            items.extend(self._get_page_md_items(data))
+            next_page_header = response.headers.get('x-next-page')
+
+        return items
+
     async def get_md_urls(self, repo_url: str) -> List[str]:
         """
         Get the directory structure of a GitLab repository.
@@ -31,37 +91,101 @@ class GitlabRepoService:
         
         owner, repo = match.groups()
         headers = {'Authorization': f'Bearer {self.config_service.get_gitlab_token() }'}
-        
-        structure = []
-        page = 1
-        per_page = 100
+        tree_url = f'{self.config_service.get_gitlab_base_url()}/api/v4/projects/{owner}%2F{repo}/repository/tree'
+
+        items = await self._get_md_items(tree_url, headers)
+        return [f"{repo_url}/{self.config_service.get_gitlab_slug()}/{item['path']}" for item in items]
 
-        while True:
-            params = {"recursive": "true", "page": page, "per_page": per_page}
-            response = await self.http_client.get(
-                f'{self.config_service.get_gitlab_base_url()}/api/v4/projects/{owner}%2F{repo}/repository/tree',
-                headers=headers,
-                params=params
-            )
+    async def get_md_changes(self, repo_url: str) -> RepoChanges:
+        """
+        Get the .md files of a GitLab repository that changed since the last saved sync.
+        The head commit is resolved first so an unchanged repo costs a single request.
+        Otherwise the tree of the head commit is listed and its blob SHAs are
+        diffed against the recorded ones.
+
+        Args:
+            repo_url: The GitLab repository URL.
 
-            response.raise_for_status()
+        Returns:
+            Added, modified and deleted .md URLs.
+        """
+        match = re.search(r'gitlab\.[^/]+/([^/]+)/([^/]+?)(?:\.git)?$', repo_url)
+        if not match:
+            raise ValueError("Invalid GitLab URL format")
         
-            data = response.json()
-            if not data:
-                break
+        owner, repo = match.groups()
+        headers = {'Authorization': f'Bearer {self.config_service.get_gitlab_token() }'}
+        project_url = f'{self.config_service.get_gitlab_base_url()}/api/v4/projects/{owner}%2F{repo}'
+        sync_state = self._get_sync_state()
 
-            for item in data:
-                if item.get('type') == 'blob' and not any(excluded in item['path'] for excluded in ['.git/', 'node_modules/', '__pycache__/']):
-                    if item['path'].endswith('.md'):
-                        structure.append(f"{repo_url}/{self.config_service.get_gitlab_slug()}/{item['path']}")
+        # Resolve the head commit of the default branch
+        response = await self.http_client.get(f'{project_url}/repository/commits', headers=headers, params={"per_page": 1})
+        response.raise_for_status()
+        commits = response.json()
+        if not commits:
+            raise ValueError(f"Failed to get repository head commit: {repo_url} has no commits")
 
-            next_page_header = response.headers.get('x-next-page')
-            if next_page_header:
-                page = int(next_page_header)
-            else:
-                break
+        commit_sha = commits[0]['id']
+        if commit_sha == sync_state.get_commit_sha(repo_url):
+            return sync_state.get_changes(repo_url, commit_sha, None)
+
+        items = await self._get_md_items(f'{project_url}/repository/tree', headers, ref=commit_sha)
+        blobs = {f"{repo_url}/{self.config_service.get_gitlab_slug()}/{item['path']}": item['id'] for item in items}
+        return sync_state.get_changes(repo_url, commit_sha, blobs)
+
+    def save_md_changes(self, changes: RepoChanges) -> None:
+        """Record the repository snapshot once its changes were ingested."""
+        self._get_sync_state().save(changes)
+
+    def reset_md_changes(self) -> None:
+        """Forget the recorded snapshots, so that the next sync reports every markdown file as added."""
+        self._get_sync_state().clear()
+
+    async def get_md_docs(self, repo_url: str) -> List[Dict[str, str]]:
+        """
+        Get the .md files of a GitLab repository from its archive
+        i.e. a single request instead of listing the tree and crawling each file.
+
+        Args:
+            repo_url: The GitLab repository URL.
+
+        Returns:
+            {url, markdown} records.
+        """
+        match = re.search(r'gitlab\.[^/]+/([^/]+)/([^/]+?)(?:\.git)?$', repo_url)
+        if not match:
+            raise ValueError("Invalid GitLab URL format")
         
-        return structure
+        owner, repo = match.groups()
+        headers = {'Authorization': f'Bearer {self.config_service.get_gitlab_token() }'}
+
+        return await get_archive_md_docs(
+            self.http_client,
+            f'{self.config_service.get_gitlab_base_url()}/api/v4/projects/{owner}%2F{repo}/repository/archive.tar.gz',
+            headers,
+            f"{repo_url}/{self.config_service.get_gitlab_slug()}"
+        )
+
+    async def get_all_md_docs(self, repo_urls: List[str], skip_failed: bool = False) -> List[Dict[str, str]]:
+        """Get the .md files of many repositories concurrently from their archives."""
+        return await get_all_md_docs(self.get_md_docs, repo_urls, self.config_service.get_repo_max_concurrent(), skip_failed)
+
+    async def get_all_md_urls(self, repo_urls: List[str], skip_failed: bool = False) -> List[str]:
+        """Get markdown URLs of many repositories concurrently, merged and deduplicated."""
+        return await get_all_md_urls(self.get_md_urls, repo_urls, self.config_service.get_repo_max_concurrent(), skip_failed)
+
+    def iter_md_urls(self, repo_urls: List[str], skip_failed: bool = False) -> AsyncIterator[List[str]]:
+        """Yield markdown URLs of many repositories concurrently as each repository completes."""
+        return iter_md_urls(self.get_md_urls, repo_urls, self.config_service.get_repo_max_concurrent(), skip_failed)
+
+    async def finalize(self) -> None:
+        """Destruct the service and close resources."""
+        if self.sync_state is not None:
+            self.sync_state.close()
+        await self.http_client.aclose()
 
-    def finalize(self) -> None:
-        return None
+    def _get_sync_state(self) -> RepoSyncState:
+        # Lazy-load the sync state
+        if self.sync_state is None:
+            self.sync_state = RepoSyncState(self.config_service.get_repo_state_dir())
+        return self.sync_state
@@ -0,0 +1,168 @@
+import os
+import mmap
+import asyncio
+import hashlib
+from pathlib import Path
+from typing import List, Dict, AsyncIterator, Tuple
+from urllib.parse import urlparse, unquote
+
+from service.config.typex import IConfigService
+from .discovery import iter_md_urls, get_all_md_urls, get_all_md_docs
+from .sync import RepoSyncState
+from .typex import RepoChanges
+
+# directories skipped while walking a local repository
+_EXCLUDED_DIRS = {'.git', 'node_modules', '__pycache__'}
+
+def _read_md_file(path: str) -> str:
+    """Read a markdown file via a memory map, decoding straight from the mapped pages."""
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ""
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return str(mapped, "utf-8", "replace")
+
+def _get_stat_key(path: str) -> Tuple[int, int]:
+    """Get the (size, mtime) of a file, which changes whenever its content does."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+# compliant with IRepoService protocol
+# this service walks a local directory or git working tree
+# i.e. repos mirrored onto the ingest box, so no HTTP or browser is involved.
+# repo URLs are local paths or file:// URLs and the .md files are
+# reported as file:// URLs.
+class LocalRepoService:
+    def __init__(self, config_service: IConfigService):
+        self.config_service = config_service
+        self.sync_state = None
+        # {path: ((size, mtime), markdown)} of the files read while hashing the
+        # changes of a repo, so that reading its docs does not read them again
+        self.md_contents: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+    def _get_repo_dir(self, repo_url: str) -> str:
+        """Get the local directory of a repo URL."""
+        repo_dir = unquote(urlparse(repo_url).path) if repo_url.startswith("file://") else repo_url
+        repo_dir = os.path.abspath(os.path.expanduser(repo_dir))
+        if not os.path.isdir(repo_dir):
+            raise ValueError(f"Local repository directory does not exist: {repo_dir}")
+        return repo_dir
+
+    def _walk_md_files(self, repo_dir: str) -> List[Tuple[str, str]]:
+        """Walk a local repository and return the (file path, file URL) of its .md files."""
+        files = []
+        for root, dirs, names in os.walk(repo_dir):
+            # Prune excluded directories in place so they are never descended into
+            dirs[:] = sorted(d for d in dirs if d not in _EXCLUDED_DIRS)
+            for name in sorted(names):
+                if name.endswith('.md'):
+                    path = os.path.join(root, name)
+                    files.append((path, Path(path).as_uri()))
+        return files
+
+    async def get_md_urls(self, repo_url: str) -> List[str]:
+        """
+        Get the .md files of a local repository.
+
+        Args:
+            repo_url: The local repository path or file:// URL.
+
+        Returns:
+            file:// URLs of the .md files.
+        """
+        repo_dir = self._get_repo_dir(repo_url)
+        files = await asyncio.to_thread(self._walk_md_files, repo_dir)
+        return [url for _, url in files]
+
+    async def get_md_docs(self, repo_url: str) -> List[Dict[str, str]]:
+        """
+        Read the .md files of a local repository.
+
+        Args:
+            repo_url: The local repository path or file:// URL.
+
+        Returns:
+            {url, markdown} records.
+        """
+        repo_dir = self._get_repo_dir(repo_url)
+
+        def _read_md_docs() -> List[Dict[str, str]]:
+            docs = []
+            for path, url in self._walk_md_files(repo_dir):
+                # Reuse the content read while hashing unless the file changed since
+                cached = self.md_contents.pop(path, None)
+                if cached is not None and cached[0] == _get_stat_key(path):
+                    markdown = cached[1]
+                else:
+                    markdown = _read_md_file(path)
+                docs.append({"url": url, "markdown": markdown})
+            return docs
+
+        return await asyncio.to_thread(_read_md_docs)
+
+    async def get_md_changes(self, repo_url: str) -> RepoChanges:
+        """
+        Get the .md files of a local repository that changed since the last saved sync.
+        Every file is hashed, and the snapshot id is the hash of all file hashes.
+        The files of a changed repo are kept in memory for get_md_docs.
+
+        Args:
+            repo_url: The local repository path or file:// URL.
+
+        Returns:
+            Added, modified and deleted .md URLs.
+        """
+        repo_dir = self._get_repo_dir(repo_url)
+
+        def _hash_md_files() -> Tuple[Dict[str, str], Dict[str, Tuple[Tuple[int, int], str]]]:
+            blobs, contents = {}, {}
+            for path, url in self._walk_md_files(repo_dir):
+                # Stat before reading, so that a write in between invalidates the content
+                stat_key = _get_stat_key(path)
+                markdown = _read_md_file(path)
+                blobs[url] = hashlib.sha1(markdown.encode("utf-8")).hexdigest()
+                contents[path] = (stat_key, markdown)
+            return blobs, contents
+
+        blobs, contents = await asyncio.to_thread(_hash_md_files)
+        snapshot_sha = hashlib.sha1("\n".join(f"{url} {sha}" for url, sha in sorted(blobs.items())).encode("utf-8")).hexdigest()
+
+        sync_state = self._get_sync_state()
+        if snapshot_sha == sync_state.get_commit_sha(repo_url):
+            return sync_state.get_changes(repo_url, snapshot_sha, None)
+
+        self.md_contents.update(contents)
+        return sync_state.get_changes(repo_url, snapshot_sha, blobs)
+
+    def save_md_changes(self, changes: RepoChanges) -> None:
+        """Record the repository snapshot once its changes were ingested."""
+        self._get_sync_state().save(changes)
+
+    def reset_md_changes(self) -> None:
+        """Forget the recorded snapshots, so that the next sync reports every markdown file as added."""
+        self._get_sync_state().clear()
+
+    async def get_all_md_urls(self, repo_urls: List[str], skip_failed: bool = False) -> List[str]:
+        """Get markdown URLs of many repositories concurrently, merged and deduplicated."""
+        return await get_all_md_urls(self.get_md_urls, repo_urls, self.config_service.get_repo_max_concurrent(), skip_failed)
+
+    def iter_md_urls(self, repo_urls: List[str], skip_failed: bool = False) -> AsyncIterator[List[str]]:
+        """Yield markdown URLs of many repositories concurrently as each repository completes."""
+        return iter_md_urls(self.get_md_urls, repo_urls, self.config_service.get_repo_max_concurrent(), skip_failed)
+
+    async def get_all_md_docs(self, repo_urls: List[str], skip_failed: bool = False) -> List[Dict[str, str]]:
+        """Read the .md files of many local repositories concurrently."""
+        return await get_all_md_docs(self.get_md_docs, repo_urls, self.config_service.get_repo_max_concurrent(), skip_failed)
+
+    async def finalize(self) -> None:
+        """Destruct the service and close resources."""
+        self.md_contents.clear()
+        if self.sync_state is not None:
+            self.sync_state.close()
+
+    def _get_sync_state(self) -> RepoSyncState:
+        # Lazy-load the sync state
+        if self.sync_state is None:
+            self.sync_state = RepoSyncState(self.config_service.get_repo_state_dir())
+        return self.sync_state
@@ -0,0 +1,89 @@
+from typing import Dict, List, Optional, Tuple
+import os
+import time
+import sqlite3
+
+from .typex import RepoChanges
+
+def diff_blobs(previous: Dict[str, str], current: Dict[str, str]) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Diff two {url: blob sha} snapshots.
+    Returns the added, modified and deleted URLs.
+    """
+    added = [url for url in current if url not in previous]
+    modified = [url for url, sha in current.items() if url in previous and previous[url] != sha]
+    deleted = [url for url in previous if url not in current]
+    return added, modified, deleted
+
+# last ingested state of repositories backed by SQLite.
+# the head commit SHA and the blob SHA of every markdown file are recorded
+# per repo, so that the next sync returns only the files that changed.
+class RepoSyncState:
+    def __init__(self, state_dir: str):
+        os.makedirs(state_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(state_dir, "repo_sync.db"))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS repos (
+                repo_url TEXT PRIMARY KEY,
+                commit_sha TEXT NOT NULL,
+                synced_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS blobs (
+                repo_url TEXT NOT NULL,
+                url TEXT NOT NULL,
+                sha TEXT NOT NULL,
+                PRIMARY KEY (repo_url, url)
+            );
+        """)
+        self.conn.commit()
+
+    def get_commit_sha(self, repo_url: str) -> Optional[str]:
+        """Get the last synced commit SHA of a repo."""
+        row = self.conn.execute("SELECT commit_sha FROM repos WHERE repo_url = ?", (repo_url,)).fetchone()
+        return row[0] if row else None
+
+    def get_blobs(self, repo_url: str) -> Dict[str, str]:
+        """Get the last synced {url: blob sha} snapshot of a repo."""
+        rows = self.conn.execute("SELECT url, sha FROM blobs WHERE repo_url = ?", (repo_url,)).fetchall()
+        return {url: sha for url, sha in rows}
+
+    def get_changes(self, repo_url: str, commit_sha: str, blobs: Optional[Dict[str, str]]) -> RepoChanges:
+        """
+        Get the changes of a repo since the last sync.
+        Blobs may be None when the commit did not change i.e. the tree was not fetched.
+        """
+        previous = self.get_blobs(repo_url)
+        if blobs is None:
+            return RepoChanges(repo_url=repo_url, commit_sha=commit_sha, blobs=previous)
+
+        added, modified, deleted = diff_blobs(previous, blobs)
+        return RepoChanges(
+            repo_url=repo_url,
+            commit_sha=commit_sha,
+            added=added,
+            modified=modified,
+            deleted=deleted,
+            blobs=blobs
+        )
+
+    def save(self, changes: RepoChanges) -> None:
+        """Record the snapshot of a repo once its changes were ingested."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO repos (repo_url, commit_sha, synced_at) VALUES (?, ?, ?)",
+            (changes.repo_url, changes.commit_sha, time.time())
+        )
+        self.conn.execute("DELETE FROM blobs WHERE repo_url = ?", (changes.repo_url,))
+        self.conn.executemany(
+            "INSERT INTO blobs (repo_url, url, sha) VALUES (?, ?, ?)",
+            [(changes.repo_url, url, sha) for url, sha in changes.blobs.items()]
+        )
+        self.conn.commit()
+
+    def clear(self) -> None:
+        """Forget the snapshots of all repos i.e. once the ingested state they describe is gone."""
+        self.conn.execute("DELETE FROM repos")
+        self.conn.execute("DELETE FROM blobs")
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
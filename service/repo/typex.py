@@ -1,12 +1,55 @@
-from typing import List, Protocol
+from typing import List, Dict, Protocol, AsyncIterator
+from dataclasses import dataclass, field
+
+@dataclass
+class RepoChanges:
+    """Represents the markdown changes of a repo since its last sync."""
+    repo_url: str
+    commit_sha: str
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    # current {url: blob sha} snapshot, recorded once the changes are ingested
+    blobs: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.modified or self.deleted)
 
 # repo services must implement this protocol
-class IRepoService(Protocol): 
+class IRepoService(Protocol):
     async def get_md_urls(self, repo_url: str) -> List[str]:
         """Get repository markdown URLs."""
         pass
 
-    def finalize(self) -> None:
-        """Destruct the service and close resources."""
+    async def get_all_md_urls(self, repo_urls: List[str], skip_failed: bool = False) -> List[str]:
+        """Get markdown URLs of many repositories concurrently, merged and deduplicated. Raises if a repository fails unless `skip_failed`."""
+        pass
+
+    def iter_md_urls(self, repo_urls: List[str], skip_failed: bool = False) -> AsyncIterator[List[str]]:
+        """Yield markdown URLs of many repositories concurrently as each repository completes. Raises if a repository fails unless `skip_failed`."""
+        pass
+
+    async def get_md_docs(self, repo_url: str) -> List[Dict[str, str]]:
+        """Get repository markdown files as {url, markdown} records from the repository archive."""
+        pass
+
+    async def get_all_md_docs(self, repo_urls: List[str], skip_failed: bool = False) -> List[Dict[str, str]]:
+        """Get markdown files of many repositories concurrently from their archives. Raises if a repository fails unless `skip_failed`."""
         pass
 
+    async def get_md_changes(self, repo_url: str) -> RepoChanges:
+        """Get the added, modified and deleted markdown URLs since the last saved sync."""
+        pass
+
+    def save_md_changes(self, changes: RepoChanges) -> None:
+        """Record the repository snapshot once its changes were ingested."""
+        pass
+
+    def reset_md_changes(self) -> None:
+        """Forget the recorded snapshots, so that the next sync reports every markdown file as added."""
+        pass
+
+    async def finalize(self) -> None:
+        """Destruct the service and close resources."""
+        pass
@@ -1,10 +1,16 @@
 """
 Command-line utility to perform test commands.
 """
+import io
+import os
 import sys
 import asyncio
 import argparse
 import json
+import time
+import random
+import tarfile
+import tempfile
 from typing import Dict, Callable, Awaitable, Optional, Any, List
 from datetime import datetime
 from dotenv import load_dotenv
@@ -15,11 +21,13 @@ from pydantic import BaseModel, Field
 from graphiti_core.nodes import EpisodeType        
 
 from service.config.envvars import EnvVarsConfigService
-from service.repo.github import GithubRepoService
-from service.repo.gitlab import GitlabRepoService
+from service.repo.factory import get_repo_service
+from service.repo.archive import iter_archive_md_files
 from service.crawl.craw4ai import AICrawlService
-from service.chunker.semantic import SemanticChunkerService
+from service.chunker.factory import get_chunker_service
 from service.chunker.simple import SimpleChunkerService
+from service.chunker.lexical import LexicalChunkerService
+from service.chunker.spans import iter_window_spans
 from service.graph.graphiti import GraphitiGraphService
 from service.graph.neo4j import Neo4jGraphService
 from service.rag.naive import NaiveRAGService
@@ -35,7 +43,7 @@ def ingest_progress_callback(ingestor: str, current: int, total: int):
 async def repo_svc_tester(repo_urls: str) -> None:
     # Initialize services
     cfg_svc = EnvVarsConfigService()
-    repo_svc = GithubRepoService(cfg_svc) if cfg_svc.get_repo_type() == "github" else GitlabRepoService(cfg_svc)
+    repo_svc = get_repo_service(cfg_svc)
 
     try:
         repo_urls = repo_urls.split(',')
@@ -43,9 +51,7 @@ async def repo_svc_tester(repo_urls: str) -> None:
             raise ValueError("No repo URLs provided. Please provide a comma-delimited list of repo URLs.")
 
         print(f"Received the following repo URLs: {repo_urls}")
-        md_urls = []
-        for repo_url in repo_urls:
-            md_urls.extend(await repo_svc.get_md_urls(repo_url.strip()))
+        md_urls = await repo_svc.get_all_md_urls(repo_urls, skip_failed=True)
 
         print(f"Found the following md URLs: {md_urls}")
     except Exception as e:
@@ -53,13 +59,82 @@ async def repo_svc_tester(repo_urls: str) -> None:
     finally:
         # Finalize services
         cfg_svc.finalize()
-        repo_svc.finalize()
+        await repo_svc.finalize()
+
+# define `repo_sync_tester` as a command processor to test incremental repo sync.
+# the first run reports every .md file as added, the next ones only the diff.
+# snapshots go to a tester state dir, never to the one the ingest relies on.
+async def repo_sync_tester(repo_urls: str) -> None:
+    os.environ["REPO_STATE_DIR"] = os.path.join(tempfile.gettempdir(), "repo_sync_tester")
+
+    # Initialize services
+    cfg_svc = EnvVarsConfigService()
+    repo_svc = get_repo_service(cfg_svc)
+
+    try:
+        for repo_url in repo_urls.split(','):
+            changes = await repo_svc.get_md_changes(repo_url.strip())
+            print(f"{changes.repo_url} @ {changes.commit_sha}: {len(changes.added)} added, {len(changes.modified)} modified, {len(changes.deleted)} deleted")
+            for url in changes.added + changes.modified + changes.deleted:
+                print(url)
+
+            repo_svc.save_md_changes(changes)
+    except Exception as e:
+        print(f"Build error occurred: {e}")
+    finally:
+        # Finalize services
+        cfg_svc.finalize()
+        await repo_svc.finalize()
+
+# build a tar.gz archive shaped like a GitHub `/tarball` i.e. with the repo
+# wrapped in a single top-level folder, holding the given {path: content} files.
+def build_repo_archive(archive_path: str, files: Dict[str, str]) -> None:
+    with tarfile.open(archive_path, "w:gz") as tar:
+        for path, content in files.items():
+            data = content.encode("utf-8")
+            member = tarfile.TarInfo(f"owner-repo-0123abc/{path}")
+            member.size = len(data)
+            tar.addfile(member, io.BytesIO(data))
+
+# define `repo_archive_tester` as a command processor to test repo archive extraction
+# against a local tar.gz archive i.e. one downloaded from GitHub `/tarball`.
+# without an existing archive, it checks a fixture archive built in a temp dir.
+async def repo_archive_tester(archive_path: str) -> None:
+    try:
+        expected_paths = None
+        with tempfile.TemporaryDirectory() as temp_dir:
+            if not os.path.isfile(archive_path):
+                archive_path = os.path.join(temp_dir, "repo.tar.gz")
+                build_repo_archive(archive_path, {
+                    "README.md": "# Repo\n\nTop-level readme.",
+                    "docs/guide.md": "# Guide\n\nNested doc with unicode: caf\u00e9.",
+                    "docs/empty.md": "",
+                    "src/main.go": "package main",
+                    "node_modules/pkg/README.md": "# Excluded",
+                    ".git/description.md": "Excluded",
+                })
+                expected_paths = ["README.md", "docs/guide.md", "docs/empty.md"]
+
+            with open(archive_path, "rb") as archive:
+                files = list(iter_archive_md_files(archive))
+
+        print(f"Extracted {len(files)} md files from {archive_path}:")
+        for path, markdown in files:
+            print(f"{path} - {len(markdown)} chars")
+
+        if expected_paths is not None:
+            paths = [path for path, _ in files]
+            if paths != expected_paths:
+                raise ValueError(f"Expected md files {expected_paths}, got {paths}")
+            print("Fixture archive extracted as expected")
+    except Exception as e:
+        print(f"Build error occurred: {e}")
 
 # define `chunker_svc_tester` as a command processor to test repo service.
 async def chunker_svc_tester(_: str) -> None:
     # Initialize services
     cfg_svc = EnvVarsConfigService()
-    chunker_svc = SemanticChunkerService(cfg_svc)
+    chunker_svc = get_chunker_service(cfg_svc)
 
     try:
         sample_text = """
@@ -104,6 +179,83 @@ async def chunker_svc_tester(_: str) -> None:
         cfg_svc.finalize()
         chunker_svc.finalize()
 
+# define `chunker_bench_tester` as a command processor to benchmark chunking.
+# it times the single-pass chunkers on repetitive synthetic markdown of
+# increasing sizes (comma-delimited MB); a constant MB/s shows linear time.
+async def chunker_bench_tester(sizes_mb: str) -> None:
+    # Initialize services
+    cfg_svc = EnvVarsConfigService()
+    chunker_svc = SimpleChunkerService(cfg_svc)
+    lexical_svc = LexicalChunkerService(cfg_svc)
+    config = cfg_svc.get_chunking_config()
+
+    try:
+        section = "## Section\n\n" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20 + "\n\n"
+        for size_mb in [float(size) for size in sizes_mb.split(",")]:
+            content = section * int(size_mb * 1024 * 1024 / len(section))
+
+            start_time = time.perf_counter()
+            chunks = sum(1 for _ in chunker_svc.iter_chunks(content, "bench", "bench.md"))
+            paragraph_secs = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            windows = sum(1 for _ in iter_window_spans(content, config.chunk_size, config.chunk_overlap, config.min_chunk_size))
+            window_secs = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            topics = len(lexical_svc.get_chunk_spans(content))
+            lexical_secs = time.perf_counter() - start_time
+
+            print(f"{size_mb:.1f}MB - paragraphs: {chunks} chunks in {paragraph_secs:.2f}s ({size_mb / paragraph_secs:.1f}MB/s), "
+                  f"windows: {windows} chunks in {window_secs:.2f}s ({size_mb / window_secs:.1f}MB/s), "
+                  f"lexical: {topics} chunks in {lexical_secs:.2f}s ({size_mb / lexical_secs:.1f}MB/s)")
+    except Exception as e:
+        print(f"Test error occurred: {e}")
+    finally:
+        # Finalize services
+        cfg_svc.finalize()
+        chunker_svc.finalize()
+        lexical_svc.finalize()
+
+# define `chunker_spans_tester` as a command processor to check window chunking.
+# it slides windows over a document whose boundary sits at the very end of a
+# window, then over random documents (the given number of cases), and checks
+# that chunks cover the span without gaps and that no chunk lies inside the
+# previous one i.e. nothing is embedded twice.
+async def chunker_spans_tester(cases: str) -> None:
+    def _check(content: str, chunk_size: int, chunk_overlap: int, min_chunk_size: int, start: int) -> Optional[str]:
+        spans = list(iter_window_spans(content, chunk_size, chunk_overlap, min_chunk_size, start))
+        if not spans or spans[0][0] != start or spans[-1][1] != len(content):
+            return f"spans {spans} do not cover {start}-{len(content)}"
+        for (prev_start, prev_end), (span_start, span_end) in zip(spans, spans[1:]):
+            if span_start > prev_end:
+                return f"gap between {(prev_start, prev_end)} and {(span_start, span_end)}"
+            if span_start <= prev_start or span_end <= prev_end:
+                return f"{(span_start, span_end)} lies inside {(prev_start, prev_end)}"
+        return None
+
+    try:
+        rand = random.Random(42)
+        # Boundary at the last character of the first window
+        errors = [
+            _check("x" * 122 + ".", 122, 100, 10, 0),
+            _check("y" * 18 + "x" * 122 + ".", 122, 100, 10, 18)
+        ]
+        failures = [error for error in errors if error]
+        for _ in range(int(cases or 1000)):
+            content = "".join(rand.choice("abc .\n") for _ in range(rand.randint(1, 600)))
+            chunk_size = rand.randint(2, 200)
+            # ChunkingConfig keeps the overlap below the chunk size
+            error = _check(content, chunk_size, rand.randint(0, chunk_size - 1), rand.randint(1, chunk_size), rand.randint(0, len(content) - 1))
+            if error:
+                failures.append(error)
+
+        print(f"Window spans: {len(failures)} failures")
+        for error in failures[:10]:
+            print(error)
+    except Exception as e:
+        print(f"Test error occurred: {e}")
+
 # define `graphiti_svc_tester` as a command processor to test repo service.
 async def graphiti_svc_tester(_: str) -> None:
     # Initialize services
@@ -399,6 +551,15 @@ async def neo4j_svc_tester(_: str) -> None:
         for row in records:
             print(row)
 
+        query = """
+            MATCH (m:Manager)-[:INVOKED]->(a:Agent)
+            RETURN a.name as agent, m.name as manager
+            ORDER BY a.name DESC
+        """
+        print(f"Streaming Agents Query '{query}' (agent column only):")
+        async for row in graph_svc.iter_query(query, columns=["agent"]):
+            print(row)
+
         query = "CALL dbms.components()"
         records = await graph_svc.query(query)
         print(f"Components Query '{query}' returned {len(records)} records:")
@@ -417,7 +578,11 @@ async def neo4j_svc_tester(_: str) -> None:
 # input arguments, returns None and must be awaited. 
 processors: Dict[str, Callable[..., Awaitable [None]]] = {
     "test_repo": repo_svc_tester,
+    "test_repo_archive": repo_archive_tester,
+    "test_repo_sync": repo_sync_tester,
     "test_chunker": chunker_svc_tester,
+    "test_chunker_bench": chunker_bench_tester,
+    "test_chunker_spans": chunker_spans_tester,
     "test_graphiti": graphiti_svc_tester,
     "test_neo4j": neo4j_svc_tester
 }